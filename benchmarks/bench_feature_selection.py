@@ -0,0 +1,23 @@
+from depynd.feature_selection import select
+
+from .datasets import gaussian_graphical_model, f1_score
+
+
+class Select:
+    params = (['mifs', 'mrmr'], [200, 1000], [10, 20], ['continuous', 'discrete', 'mixed'])
+    param_names = ['method', 'n', 'd', 'kind']
+    timeout = 120
+
+    def setup(self, method, n, d, kind):
+        # The target is the last variable of the model, whose neighbors are the relevant features.
+        X, adj = gaussian_graphical_model(n, d + 1, kind=kind, edge_prob=3 / d)
+        self.X, self.y, self.relevant = X[:, :-1], X[:, -1], adj[-1, :-1]
+
+    def time_select(self, method, n, d, kind):
+        select(self.X, self.y, method=method)
+
+    def track_f1(self, method, n, d, kind):
+        selected = select(self.X, self.y, method=method)
+        return f1_score([j in selected for j in range(len(self.relevant))], self.relevant)
+
+    track_f1.unit = 'F1'
@@ -0,0 +1,7 @@
+class Import:
+    # Each import is timed in a fresh interpreter, as paid by short-lived processes on every start.
+    params = ['depynd', 'depynd.information', 'depynd.feature_selection', 'depynd.markov_networks']
+    param_names = ['module']
+
+    def timeraw_import(self, module):
+        return 'import %s' % module
@@ -0,0 +1,72 @@
+import numpy as np
+
+from depynd.information import _mi_knn, _mi_plugin, _mi_dr, conditional_mutual_information
+
+from .datasets import gaussian_pair, binary_channel, gaussian_graphical_model
+
+
+class MIKnn:
+    params = ([100, 1000, 10000], ['brute', 'tree'])
+    param_names = ['n', 'algorithm']
+
+    def setup(self, n, algorithm):
+        if algorithm == 'brute' and n > 1000:
+            raise NotImplementedError
+        self.x, self.y, self.mi = gaussian_pair(n)
+
+    def time_mi_knn(self, n, algorithm):
+        _mi_knn(self.x, self.y, 3, algorithm=algorithm)
+
+    def peakmem_mi_knn(self, n, algorithm):
+        _mi_knn(self.x, self.y, 3, algorithm=algorithm)
+
+    def track_error(self, n, algorithm):
+        return abs(_mi_knn(self.x, self.y, 3, algorithm=algorithm) - self.mi)
+
+    track_error.unit = 'nats'
+
+
+class MIPlugin:
+    params = [1000, 100000]
+    param_names = ['n']
+
+    def setup(self, n):
+        self.x, self.y, self.mi = binary_channel(n)
+
+    def time_mi_plugin(self, n):
+        _mi_plugin(self.x, self.y)
+
+    def track_error(self, n):
+        return abs(_mi_plugin(self.x, self.y) - self.mi)
+
+    track_error.unit = 'nats'
+
+
+class MIDr:
+    params = ([500, 2000], ['kmeans', 'random'], ['slsqp', 'lsmi'])
+    param_names = ['n', 'centers', 'solver']
+    timeout = 120
+
+    def setup(self, n, centers, solver):
+        self.x, self.y, self.mi = gaussian_pair(n)
+
+    def time_mi_dr(self, n, centers, solver):
+        np.random.seed(0)
+        _mi_dr(self.x, self.y, 0.5, 100, 1000, centers=centers, solver=solver)
+
+    def track_error(self, n, centers, solver):
+        np.random.seed(0)
+        return abs(_mi_dr(self.x, self.y, 0.5, 100, 1000, centers=centers, solver=solver) - self.mi)
+
+    track_error.unit = 'nats'
+
+
+class CMI:
+    params = ([200, 1000], [1, 4], ['continuous', 'discrete', 'mixed'], ['auto', 'knn_cmi'])
+    param_names = ['n', 'd_z', 'kind', 'mi_estimator']
+
+    def setup(self, n, d_z, kind, mi_estimator):
+        self.X, _ = gaussian_graphical_model(n, d_z + 2, kind=kind)
+
+    def time_conditional_mutual_information(self, n, d_z, kind, mi_estimator):
+        conditional_mutual_information(self.X[:, 0], self.X[:, 1], self.X[:, 2:], mi_estimator=mi_estimator)
@@ -0,0 +1,39 @@
+import numpy as np
+
+from depynd.markov_networks import select
+
+from .datasets import gaussian_graphical_model, f1_score
+
+# Regularization parameters fixed for each method, so that timings do not depend on model selection.
+LAMBDAS = {'glasso': 0.1, 'skeptic': 0.1, 'gsmn': 0.02, 'iamb': 0.02, 'gsmple': 0.02}
+
+
+class Select:
+    params = (list(LAMBDAS), [200, 1000], [5, 10], ['continuous', 'discrete', 'mixed'])
+    param_names = ['method', 'n', 'd', 'kind']
+    timeout = 300
+
+    def setup(self, method, n, d, kind):
+        self.X, self.adj = gaussian_graphical_model(n, d, kind=kind)
+
+    def time_select(self, method, n, d, kind):
+        select(self.X, method=method, lamb=LAMBDAS[method])
+
+    def track_f1(self, method, n, d, kind):
+        adj = select(self.X, method=method, lamb=LAMBDAS[method])
+        upper = np.triu_indices(len(adj), 1)
+        return f1_score(adj[upper], self.adj[upper])
+
+    track_f1.unit = 'F1'
+
+
+class Stars:
+    params = ['glasso', 'skeptic', 'gsmn']
+    param_names = ['method']
+    timeout = 300
+
+    def setup(self, method):
+        self.X, _ = gaussian_graphical_model(200, 5)
+
+    def time_select_stars(self, method):
+        select(self.X, method=method, criterion='stars', lamb=[0.01, 0.05, 0.1, 0.2], rep_num=10, random_state=0)
@@ -0,0 +1,82 @@
+import numpy as np
+
+
+def gaussian_pair(n, rho=0.6, seed=0):
+    """Sample a pair of correlated Gaussian variables, whose mutual information is known.
+
+    Returns
+    -------
+    x : array, shape (n, 1)
+    y : array, shape (n, 1)
+    mi : float
+        True mutual information between ``x`` and ``y``.
+    """
+    rng = np.random.RandomState(seed)
+    xy = rng.multivariate_normal(np.zeros(2), [[1, rho], [rho, 1]], n)
+    return xy[:, [0]], xy[:, [1]], -0.5 * np.log(1 - rho ** 2)
+
+
+def binary_channel(n, p=0.1, seed=0):
+    """Sample a uniform bit and its copy flipped with probability ``p``, whose mutual information is known.
+
+    Returns
+    -------
+    x : array, shape (n, 1)
+    y : array, shape (n, 1)
+    mi : float
+        True mutual information between ``x`` and ``y``.
+    """
+    rng = np.random.RandomState(seed)
+    x = rng.randint(0, 2, n)
+    y = x ^ (rng.rand(n) < p)
+    return x[:, None], y[:, None], np.log(2) + p * np.log(p) + (1 - p) * np.log(1 - p)
+
+
+def gaussian_graphical_model(n, d, kind='continuous', edge_prob=None, seed=0):
+    """Sample from a Gaussian graphical model with a random sparse structure.
+
+    The precision matrix has equal weights on the edges of an Erdos-Renyi graph, and its diagonal is shifted so that
+    the smallest eigenvalue is 0.5.
+
+    Parameters
+    ----------
+    n : int
+        Number of samples.
+    d : int
+        Number of variables.
+    kind : {'continuous', 'discrete', 'mixed'}, default 'continuous'
+        If 'discrete', every variable is discretized into 3 levels at its tertiles. If 'mixed', every other variable is.
+    edge_prob : float or None, default None
+        Probability of each edge. If None, ``2 / d``.
+    seed : int, default 0
+        Seed of the random number generator.
+
+    Returns
+    -------
+    X : array, shape (n, d)
+        Observations of the variables.
+    adj : array, shape (d, d)
+        True adjacency matrix of the model.
+    """
+    rng = np.random.RandomState(seed)
+    edge_prob = 2 / d if edge_prob is None else edge_prob
+    upper = np.triu(rng.rand(d, d) < edge_prob, 1)
+    adj = upper | upper.T
+    precision = 0.5 * adj
+    precision += (0.5 - np.linalg.eigvalsh(precision)[0]) * np.eye(d)
+    X = rng.multivariate_normal(np.zeros(d), np.linalg.inv(precision), n)
+    if kind in ['discrete', 'mixed']:
+        for j in range(0, d, 1 if kind == 'discrete' else 2):
+            X[:, j] = np.digitize(X[:, j], np.percentile(X[:, j], [100 / 3, 200 / 3]))
+    elif kind != 'continuous':
+        raise ValueError('`%s` is not implemented.' % kind)
+    return X, adj
+
+
+def f1_score(estimated, true):
+    """F1 score of estimated edges or features against the true ones, given as boolean masks."""
+    estimated, true = np.asarray(estimated, dtype=bool), np.asarray(true, dtype=bool)
+    tp = np.sum(estimated & true)
+    if tp == 0:
+        return 0.0
+    return 2 * tp / (np.sum(estimated) + np.sum(true))
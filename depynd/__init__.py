@@ -1,11 +1,32 @@
-from depynd import (
-    information,
-    feature_selection,
-    markov_networks,
-)
+import sys
+from importlib import import_module
+
+from depynd._profile import profile
 
 __all__ = [
     'information',
     'feature_selection',
     'markov_networks',
+    'profile',
 ]
+
+# Subpackages are imported lazily below. For the same reason, the slow modules of scikit-learn, e.g., sklearn.cluster,
+# sklearn.covariance, sklearn.linear_model, sklearn.neighbors and sklearn.preprocessing, are imported inside the
+# functions using them throughout the package instead of at the top of modules.
+_SUBPACKAGES = ['information', 'feature_selection', 'markov_networks']
+
+
+def __getattr__(name):
+    # Subpackages are imported on first access, so that ``import depynd`` stays cheap for processes using a few of them.
+    if name not in _SUBPACKAGES:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+    return import_module('.' + name, __name__)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBPACKAGES))
+
+
+# Module-level ``__getattr__`` is only supported since Python 3.7.
+if sys.version_info < (3, 7):
+    from depynd import information, feature_selection, markov_networks  # noqa: F401
@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+
+# Profiles being recorded, and the lock guarding them against estimators running in threads.
+_profiles = []
+_lock = threading.Lock()
+_local = threading.local()
+
+
+class Profile:
+    """Records of estimator calls and phases of learners made in a :func:`profile` context.
+
+    Attributes
+    ----------
+    estimators : dict
+        Statistics for each pair of an estimation function and an MI estimator, keyed by the names of both. Each entry
+        is a dict with ``calls``, the number of estimates ``estimates``, the cumulative wall time ``time`` in seconds,
+        and ``n_samples`` and ``n_conditioning``, which count calls by their numbers of samples and conditioning
+        features respectively.
+    phases : dict
+        Statistics for each phase of learners, such as 'gsmn.grow' and 'stars.replicate', keyed by its name. Each entry
+        is a dict with ``calls`` and the cumulative wall time ``time`` in seconds.
+    """
+
+    def __init__(self):
+        self.estimators = {}
+        self.phases = {}
+
+    def report(self):
+        """Return the records as nested dicts and lists, sorted by the cumulative time in descending order.
+
+        Returns
+        -------
+        report : dict
+            Dict with ``estimators``, a list of dicts with ``function`` and ``mi_estimator`` in addition to the
+            statistics, and ``phases``, a list of dicts with ``phase`` in addition to the statistics.
+        """
+        estimators = [dict(function=function, mi_estimator=mi_estimator, **_copy(stats))
+                      for (function, mi_estimator), stats in self.estimators.items()]
+        phases = [dict(phase=phase, **_copy(stats)) for phase, stats in self.phases.items()]
+        return {'estimators': sorted(estimators, key=lambda stats: -stats['time']),
+                'phases': sorted(phases, key=lambda stats: -stats['time'])}
+
+    def _record_estimator(self, function, mi_estimator, n_samples, n_conditioning, n_estimates, elapsed):
+        stats = self.estimators.setdefault((function, mi_estimator), {
+            'calls': 0, 'estimates': 0, 'time': 0.0, 'n_samples': Counter(), 'n_conditioning': Counter()})
+        stats['calls'] += 1
+        stats['estimates'] += n_estimates
+        stats['time'] += elapsed
+        stats['n_samples'][n_samples] += 1
+        stats['n_conditioning'][n_conditioning] += 1
+
+    def _record_phase(self, phase, elapsed):
+        stats = self.phases.setdefault(phase, {'calls': 0, 'time': 0.0})
+        stats['calls'] += 1
+        stats['time'] += elapsed
+
+
+@contextmanager
+def profile():
+    """Record calls of MI and CMI estimators and phases of learners made in the context.
+
+    Only the outermost estimation function is recorded for each call, e.g., a call of
+    :func:`~depynd.information.conditional_mutual_information` computed as the difference of two MI estimates is
+    recorded once. Calls made in threads are recorded, except those in worker threads of an estimation function, e.g.,
+    with ``n_jobs`` in :func:`~depynd.information.pairwise_mutual_information`, which are nested in its call. Calls
+    in worker processes, e.g., with ``n_jobs`` in :mod:`depynd.feature_selection` or in 'gsmn' and 'iamb', are not
+    recorded.
+
+    Yields
+    ------
+    profile : Profile
+        Records, which keep being updated until the context exits.
+    """
+    prof = Profile()
+    with _lock:
+        _profiles.append(prof)
+    try:
+        yield prof
+    finally:
+        with _lock:
+            _profiles.remove(prof)
+
+
+def _profiled(function, describe):
+    """Decorate an estimation function to be recorded in :func:`profile` contexts.
+
+    ``describe`` receives the arguments of the call, and returns the MI estimator, the number of samples, the number of
+    conditioning features and the number of estimates.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _profiles or getattr(_local, 'depth', 0) > 0:
+                return func(*args, **kwargs)
+            _local.depth = 1
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                _local.depth = 0
+            elapsed = time.perf_counter() - start
+            mi_estimator, n_samples, n_conditioning, n_estimates = describe(*args, **kwargs)
+            with _lock:
+                for prof in _profiles:
+                    prof._record_estimator(function, mi_estimator, n_samples, n_conditioning, n_estimates, elapsed)
+            return result
+        return wrapper
+    return decorator
+
+
+def _inherit_depth(func):
+    """Wrap a function to be run in worker threads, so that estimation functions called in it are recorded as nested
+    in the call of the thread creating the wrapper, if any, instead of being recorded again at the top level."""
+    depth = getattr(_local, 'depth', 0)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        outer = getattr(_local, 'depth', 0)
+        _local.depth = depth
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.depth = outer
+    return wrapper
+
+
+@contextmanager
+def _phase(name):
+    # Record the wall time of a phase of a learner in :func:`profile` contexts.
+    if not _profiles:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _lock:
+            for prof in _profiles:
+                prof._record_phase(name, elapsed)
+
+
+def _copy(stats):
+    return {key: dict(value) if isinstance(value, Counter) else value for key, value in stats.items()}
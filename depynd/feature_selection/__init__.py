@@ -1,5 +1,5 @@
 from ._mrmr import _mrmr
 from ._mifs import _mifs
-from ._select import select
+from ._select import select, select_multi
 
-__all__ = ['_mrmr', '_mifs', 'select']
+__all__ = ['_mrmr', '_mifs', 'select', 'select_multi']
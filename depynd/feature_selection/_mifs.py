@@ -1,15 +1,16 @@
 import numpy as np
 
-from depynd.information import conditional_mutual_information
+from depynd._profile import _phase
+from depynd.information._cache import _check_cache
 
 
-def _mifs(X, y, lamb, k, **kwargs):
+def _mifs(X, y, lamb, k, n_jobs=None, cache=None, **kwargs):
     """Select effective features in ``X`` on predicting ``y`` using mutual-information-based feature selection
     [brown2012conditional]_.
 
     Parameters
     ----------
-    X : array-like, shape (n_samples, n_features)
+    X : array-like or Dataset, shape (n_samples, n_features)
         Observations of feature variables.
     y : array-like, shape (n_samples)
         Observations of the target variable.
@@ -17,6 +18,11 @@ def _mifs(X, y, lamb, k, **kwargs):
         Threshold for independence tests. Ignored if `k` is specified.
     k : int or None
         Number of selected features.
+    n_jobs : int or None, default None
+        Number of processes scoring candidates in parallel in each round. ``None`` means 1 unless in a
+        ``joblib.parallel_backend`` context, and -1 means using all processors.
+    cache : CMICache or None, default None
+        Cache of CMI estimates, which is shared with the other feature selectors for the same ``X`` and ``y``.
     kwargs : dict
         Optional parameters for MI estimation.
 
@@ -31,39 +37,39 @@ def _mifs(X, y, lamb, k, **kwargs):
         information theoretic feature selection." Journal of machine learning research 13.Jan (2012): 27-66.
     """
     n, d = X.shape
+    # The target is cached as the column next to the features.
+    cache = _check_cache(cache, X, y, **kwargs)
     selected = []
     if k is not None:
-        selected = _grow(selected, X, y, -np.inf, k, **kwargs)
+        with _phase('mifs.grow'):
+            selected = _grow(selected, d, -np.inf, k, cache, n_jobs)
     else:
-        selected = _grow(selected, X, y, lamb, d, **kwargs)
-        selected = _shrink(selected, X, y, lamb, 0, **kwargs)
+        with _phase('mifs.grow'):
+            selected = _grow(selected, d, lamb, d, cache, n_jobs)
+        with _phase('mifs.shrink'):
+            selected = _shrink(selected, d, lamb, 0, cache, n_jobs)
     return selected
 
 
-def _grow(selected, X, y, lamb, k, **kwargs):
-    n, d = X.shape
+def _grow(selected, d, lamb, k, cache, n_jobs=None):
     while True:
-        max_cmi = -np.inf
-        not_selected = set(range(d)) - set(selected)
-        z = X[:, selected]
-        for i in not_selected:
-            x = X[:, i]
-            cmi = conditional_mutual_information(x, y, z, **kwargs)
-            if max_cmi < cmi:
-                max_cmi = cmi
-                max_idx = i
-        if max_cmi <= lamb or len(selected) == k:
+        not_selected = sorted(set(range(d)) - set(selected))
+        if not not_selected or len(selected) == k:
+            return selected
+        cmis = cache.batch_conditional_mutual_information(d, not_selected, selected, candidates_first=True,
+                                                          n_jobs=n_jobs)
+        cmis[np.isnan(cmis)] = -np.inf
+        if np.max(cmis) <= lamb:
             return selected
-        selected.append(max_idx)
+        selected.append(not_selected[np.argmax(cmis)])
 
 
-def _shrink(selected, X, y, lamb, k, **kwargs):
+def _shrink(selected, d, lamb, k, cache, n_jobs=None):
     while True:
         min_cmi = np.inf
-        for i in selected:
-            x = X[:, i]
-            z = X[:, list(set(selected) - {i})]
-            cmi = conditional_mutual_information(x, y, z, **kwargs)
+        cmis = cache.conditional_mutual_information_many([(i, d, list(set(selected) - {i})) for i in selected],
+                                                         n_jobs=n_jobs)
+        for i, cmi in zip(selected, cmis):
             if min_cmi > cmi:
                 min_cmi = cmi
                 min_idx = i
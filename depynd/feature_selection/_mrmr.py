@@ -1,15 +1,16 @@
 import numpy as np
 
-from depynd.information import mutual_information
+from depynd._profile import _phase
+from depynd.information._cache import _check_cache
 
 
-def _mrmr(X, y, lamb, k, **kwargs):
+def _mrmr(X, y, lamb, k, n_jobs=None, cache=None, **kwargs):
     """Select effective features in ``X`` on predicting ``y`` using minimum redundancy maximum relevance feature
     selection [peng2005feature]_.
 
     Parameters
     ----------
-    X : array-like, shape (n_samples, n_features)
+    X : array-like or Dataset, shape (n_samples, n_features)
         Observations of feature variables.
     y : array-like, shape (n_samples)
         Observations of the target variable.
@@ -17,6 +18,11 @@ def _mrmr(X, y, lamb, k, **kwargs):
         Threshold for independence tests. Ignored if `k` is specified.
     k : int or None
         Number of selected features.
+    n_jobs : int or None, default None
+        Number of processes estimating MI of candidates in parallel. ``None`` means 1 unless in a
+        ``joblib.parallel_backend`` context, and -1 means using all processors.
+    cache : CMICache or None, default None
+        Cache of MI estimates, which is shared with the other feature selectors for the same ``X`` and ``y``.
     kwargs : dict
         Optional parameters for MI estimation.
 
@@ -32,25 +38,33 @@ def _mrmr(X, y, lamb, k, **kwargs):
         machine intelligence 27.8 (2005): 1226-1238.
     """
     n, d = X.shape
-    if k is not None:
-        return _grow([], X, y, -np.inf, k, **kwargs)
-    else:
-        return _grow([], X, y, lamb, d, **kwargs)
+    # The target is cached as the column next to the features.
+    cache = _check_cache(cache, X, y, **kwargs)
+    with _phase('mrmr.grow'):
+        if k is not None:
+            return _grow([], d, -np.inf, k, cache, n_jobs)
+        else:
+            return _grow([], d, lamb, d, cache, n_jobs)
 
 
-def _grow(selected, X, y, lamb, k, **kwargs):
-    n, d = X.shape
+def _grow(selected, d, lamb, k, cache, n_jobs=None):
+    # Relevance is estimated once, and sums of redundancy are updated only with the newly selected feature.
+    not_selected = sorted(set(range(d)) - set(selected))
+    rel = np.zeros(d)
+    red = np.zeros(d)
+    rel[not_selected] = cache.batch_conditional_mutual_information(d, not_selected, [], candidates_first=True,
+                                                                   n_jobs=n_jobs)
+    for j in selected:
+        red[not_selected] += cache.batch_conditional_mutual_information(j, not_selected, [], candidates_first=True,
+                                                                        n_jobs=n_jobs)
     while True:
-        max_obj = -np.inf
-        not_selected = set(range(d)) - set(selected)
-        for i in not_selected:
-            x = X[:, i]
-            rel = mutual_information(x, y, **kwargs)
-            red = [mutual_information(x, X[:, j], **kwargs) for j in selected]
-            obj = rel - (np.mean(red) if red else 0)
-            if max_obj < obj:
-                max_obj = obj
-                max_idx = i
-        if max_obj <= lamb or len(selected) == k:
+        if not not_selected or len(selected) == k:
+            return selected
+        obj = rel[not_selected] - (red[not_selected] / len(selected) if selected else 0)
+        obj[np.isnan(obj)] = -np.inf
+        if np.max(obj) <= lamb:
             return selected
-        selected.append(max_idx)
+        selected.append(not_selected.pop(int(np.argmax(obj))))
+        if not_selected and len(selected) != k:
+            red[not_selected] += cache.batch_conditional_mutual_information(selected[-1], not_selected, [],
+                                                                            candidates_first=True, n_jobs=n_jobs)
@@ -1,16 +1,19 @@
 import numpy as np
-from sklearn.utils.validation import check_X_y
+from sklearn.utils.validation import check_X_y, check_array
 
 from depynd.feature_selection import _mrmr, _mifs
+from depynd.information import CMICache, Dataset
 
 
-def select(X, y, lamb=0.0, k=None, method='mifs', **kwargs):
+def select(X, y, lamb=0.0, k=None, method='mifs', n_jobs=None, cache=None, **kwargs):
     """Select effective features in ``X`` on predicting ``y``.
 
     Parameters
     ----------
-    X : array-like, shape (n_samples, n_features)
-        Observations of feature variables.
+    X : array-like, shape (n_samples, n_features) or Dataset
+        Observations of feature variables. If a :class:`~depynd.information.Dataset` is given, its validated
+        observations and column types are used, and only ``y`` is validated. Arrays in column-major order, including
+        memory-mapped ones, are used without a copy. See :class:`~depynd.information.Dataset` for memory usage.
     y : array-like, shape (n_samples)
         Observations of the target variable.
     lamb: float or None
@@ -19,14 +22,86 @@ def select(X, y, lamb=0.0, k=None, method='mifs', **kwargs):
         Number of selected features.
     method: {'mifs', 'mrmr'}, default 'mifs'
         Feature selection method.
+    n_jobs : int or None, default None
+        Number of processes scoring candidates in parallel in each round, to which ``X`` is memory-mapped. The result
+        does not depend on it. ``None`` means 1 unless in a ``joblib.parallel_backend`` context, and -1 means using
+        all processors.
+    cache : CMICache or None, default None
+        Cache of CMI estimates, which is shared among calls with the same ``X``, including those of structure learners
+        in :func:`depynd.markov_networks.select`. The target is cached as the column with index ``n_features``, and the
+        estimates which involve it are discarded when it changes.
+    kwargs : dict
+        Optional parameters for MI estimation.
 
     Returns
     -------
     indices : list
         Indices of the selected features.
     """
-    y = np.ravel(y)
-    X, y = check_X_y(X, y, ensure_min_samples=2, ensure_min_features=2)
+    if isinstance(X, Dataset):
+        dataset = X.with_target(np.ravel(y))
+        _check_n_features(dataset)
+    else:
+        dataset = Dataset(*check_X_y(X, np.ravel(y), ensure_min_samples=2, ensure_min_features=2))
+    selector = _check_params(dataset, lamb, k, method)
+    return selector(dataset, dataset.y, lamb=lamb, k=k, n_jobs=n_jobs, cache=cache, **kwargs)
+
+
+def select_multi(X, Y, lamb=0.0, k=None, method='mifs', n_jobs=None, **kwargs):
+    """Select effective features in ``X`` on predicting each column of ``Y``.
+
+    The result is the same as ``[select(X, y, ...) for y in Y.T]`` with symmetric MI estimators up to rounding errors,
+    but ``X`` is validated and its column types are detected only once, and estimates which only concern features, such
+    as MI between features used as redundancy in 'mrmr', are shared among the targets. Since the shared estimates may
+    be summed in another order, exact ties of the objectives, e.g., when a target duplicates a feature, may be resolved
+    differently from :func:`select`.
+
+    Parameters
+    ----------
+    X : array-like, shape (n_samples, n_features) or Dataset
+        Observations of feature variables. See :func:`select`.
+    Y : array-like, shape (n_samples, n_targets) or (n_samples)
+        Observations of the target variables, one per column.
+    lamb: float or None
+        Threshold for independence tests. Ignored if `k` is specified.
+    k : int or None
+        Number of selected features.
+    method: {'mifs', 'mrmr'}, default 'mifs'
+        Feature selection method.
+    n_jobs : int or None, default None
+        Number of processes scoring candidates in parallel in each round. See :func:`select`.
+    kwargs : dict
+        Optional parameters for MI estimation.
+
+    Returns
+    -------
+    indices : list of lists
+        Indices of the selected features for each target.
+    """
+    if isinstance(X, Dataset):
+        dataset = X
+        _check_n_features(dataset)
+    else:
+        dataset = Dataset(check_array(X, ensure_min_samples=2, ensure_min_features=2))
+    Y = check_array(np.atleast_2d(np.asarray(Y).T).T, ensure_min_samples=2)
+    assert len(dataset.X) == len(Y), 'X and Y must have the same length.'
+    selector = _check_params(dataset, lamb, k, method)
+    # Estimates which involve the previous target are discarded on switching targets, and the others are kept.
+    datasets = [dataset.with_target(y) for y in Y.T]
+    cache = CMICache().bind(datasets[0], **kwargs)
+    indices = []
+    for dataset in datasets:
+        cache._set_target(dataset)
+        indices.append(selector(dataset, dataset.y, lamb=lamb, k=k, n_jobs=n_jobs, cache=cache, **kwargs))
+    return indices
+
+
+def _check_n_features(dataset):
+    if dataset.shape[1] < 2:
+        raise ValueError('Found array with %d feature(s) while a minimum of 2 is required.' % dataset.shape[1])
+
+
+def _check_params(X, lamb, k, method):
     if lamb is None and k is None:
         raise ValueError('At least either `lamb` or `k` should be specified.')
     if k is not None:
@@ -35,8 +110,8 @@ def select(X, y, lamb=0.0, k=None, method='mifs', **kwargs):
     else:
         assert np.isscalar(lamb), '`lamb` must be a real value.'
     if method == 'mifs':
-        return _mifs(X, y, lamb=lamb, k=k, **kwargs)
+        return _mifs
     elif method == 'mrmr':
-        return _mrmr(X, y, lamb=lamb, k=k, **kwargs)
+        return _mrmr
     else:
         raise ValueError('`%s` is not implemented.' % method)
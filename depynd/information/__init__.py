@@ -1,7 +1,13 @@
 from ._dr import _mi_dr
-from ._knn import _mi_knn
-from ._plugin import _entropy_plugin, _mi_plugin
-from ._information import mutual_information, conditional_mutual_information
+from ._knn import _mi_knn, _cmi_knn
+from ._plugin import _entropy_plugin, _mi_plugin, _cmi_plugin
+from ._dataset import Dataset
+from ._disk_cache import DiskCache
+from ._information import mutual_information, conditional_mutual_information, batch_conditional_mutual_information
+from ._pairwise import pairwise_mutual_information
+from ._cache import CMICache
+from ._accumulator import PluginMIAccumulator
 
-__all__ = ['_mi_dr', '_mi_knn', '_entropy_plugin', '_mi_plugin', 'mutual_information',
-           'conditional_mutual_information']
+__all__ = ['_mi_dr', '_mi_knn', '_cmi_knn', '_entropy_plugin', '_mi_plugin', '_cmi_plugin', 'mutual_information',
+           'conditional_mutual_information', 'batch_conditional_mutual_information', 'pairwise_mutual_information',
+           'CMICache', 'DiskCache', 'Dataset', 'PluginMIAccumulator']
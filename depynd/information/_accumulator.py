@@ -0,0 +1,145 @@
+from collections import Counter
+
+import numpy as np
+from sklearn.utils.validation import check_array
+
+
+class PluginMIAccumulator:
+    """Streaming plug-in estimator of mutual information between discrete variables.
+
+    Observations are given in chunks by :meth:`partial_fit`, and only the tables of counts of their unique values are
+    kept, so that MI and CMI can be estimated at any time from data which does not fit in memory. Estimates are the
+    same as those of the 'plugin' estimator applied to all the chunks at once. Accumulators built in separate processes
+    are combined by :meth:`merge`.
+
+    Parameters
+    ----------
+    decay : float, default 1.0
+        Factor multiplied to the counts accumulated so far on each call of :meth:`partial_fit`, which must be in
+        (0, 1]. With ``decay < 1``, older chunks are exponentially forgotten, which acts as a sliding window of about
+        ``1 / (1 - decay)`` chunks.
+
+    Attributes
+    ----------
+    n_samples : float
+        Number of accumulated samples, weighted by the decay.
+    """
+
+    def __init__(self, decay=1.0):
+        assert 0 < decay <= 1, '`decay` must be in (0, 1].'
+        self.decay = decay
+        self.n_samples = 0
+        self._n_features = None
+        self._tables = {}
+
+    def partial_fit(self, X, Y, Z=None):
+        """Accumulate a chunk of observations.
+
+        Parameters
+        ----------
+        X : array-like, shape (n_samples, n_features_x) or (n_samples)
+            Observations of a variable.
+        Y : array-like, shape (n_samples, n_features_y) or (n_samples)
+            Observations of the other variable.
+        Z : array-like, shape (n_samples, n_features_z) or (n_samples) or None, default None
+            Observations of the conditioning variable. It must be given on every call if given once.
+
+        Returns
+        -------
+        self : PluginMIAccumulator
+        """
+        X, Y = _check_chunk(X), _check_chunk(Y)
+        Z = np.empty([len(X), 0]) if Z is None else _check_chunk(Z)
+        assert len(X) == len(Y) == len(Z), 'X, Y and Z must have the same length.'
+        n_features = X.shape[1], Y.shape[1], Z.shape[1]
+        if self._n_features is not None and n_features != self._n_features:
+            raise ValueError('Chunk with (%d, %d, %d) features does not match accumulated (%d, %d, %d) features.'
+                             % (n_features + self._n_features))
+        self._n_features = n_features
+        if self.decay < 1:
+            for table in self._tables.values():
+                for key in table:
+                    table[key] *= self.decay
+            self.n_samples *= self.decay
+        d_x, d_y, _ = n_features
+        rows, counts = np.unique(np.hstack([X, Y, Z]), axis=0, return_counts=True)
+        chunk = {}
+        for row, count in zip(rows.tolist(), counts.tolist()):
+            x, y, z = tuple(row[:d_x]), tuple(row[d_x:d_x + d_y]), tuple(row[d_x + d_y:])
+            for name, key in _keys(x, y, z):
+                chunk.setdefault(name, Counter())[key] += count
+        for name, table in chunk.items():
+            self._tables.setdefault(name, Counter()).update(table)
+        self.n_samples += len(X)
+        return self
+
+    def merge(self, other):
+        """Add the counts accumulated by another accumulator for the same variables.
+
+        Parameters
+        ----------
+        other : PluginMIAccumulator
+            Accumulator, e.g., built in another process from other chunks.
+
+        Returns
+        -------
+        self : PluginMIAccumulator
+        """
+        if other._n_features is None:
+            return self
+        if self._n_features is not None and other._n_features != self._n_features:
+            raise ValueError('Accumulator with (%d, %d, %d) features does not match accumulated (%d, %d, %d) features.'
+                             % (other._n_features + self._n_features))
+        self._n_features = other._n_features
+        for name, table in other._tables.items():
+            self._tables.setdefault(name, Counter()).update(table)
+        self.n_samples += other.n_samples
+        return self
+
+    def mutual_information(self):
+        """Estimate mutual information between ``X`` and ``Y`` from the accumulated counts.
+
+        Returns
+        -------
+        mi : float
+            Estimated mutual information between ``X`` and ``Y``.
+        """
+        return self._information('xy', 'x', 'y', None)
+
+    def conditional_mutual_information(self):
+        """Estimate conditional mutual information between ``X`` and ``Y`` given ``Z`` from the accumulated counts.
+
+        Returns
+        -------
+        cmi : float
+            Estimated conditional mutual information between ``X`` and ``Y`` given ``Z``, which equals the mutual
+            information if ``Z`` has not been given.
+        """
+        if self._n_features is not None and self._n_features[2] == 0:
+            return self.mutual_information()
+        return self._information('xyz', 'xz', 'yz', 'z')
+
+    def _information(self, joint, left, right, given):
+        # Sum of p(x, y, z) log(p(x, y, z) p(z) / (p(x, z) p(y, z))) over the joint table, where z is empty for MI.
+        if self.n_samples == 0:
+            raise ValueError('No samples have been accumulated.')
+        tables = self._tables
+        info = 0.0
+        for (x, y, z), n_xyz in tables[joint].items():
+            n_z = self.n_samples if given is None else tables[given][z]
+            info += n_xyz * np.log(n_xyz * n_z / (tables[left][x, z] * tables[right][y, z]))
+        return info / self.n_samples
+
+
+def _check_chunk(X):
+    X = np.asarray(X)
+    return check_array(np.atleast_2d(X.T).T, ensure_min_samples=1, ensure_min_features=0)
+
+
+def _keys(x, y, z):
+    # Keys of each table for a unique row. Tables for MI are keyed with an empty conditioning value, so that both MI and
+    # CMI are computed by the same formula. Tables for CMI are only kept if there are conditioning features.
+    keys = [('xy', (x, y, ())), ('x', (x, ())), ('y', (y, ()))]
+    if z:
+        keys += [('xyz', (x, y, z)), ('xz', (x, z)), ('yz', (y, z)), ('z', z)]
+    return keys
@@ -0,0 +1,330 @@
+import hashlib
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+
+from depynd.information._dataset import Dataset
+from depynd.information._disk_cache import DiskCache, _hash_column, _normalize_kwargs, _estimate_key
+from depynd.information._information import _conditional_mutual_information, _batch_conditional_mutual_information, \
+    _symmetric
+from depynd.information._pairwise import _pairwise_mutual_information
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class CMICache:
+    """Memoizing cache of conditional mutual information between columns of a data matrix.
+
+    Estimates are keyed on the unordered pair of column indices and the set of indices of conditioning columns, so
+    that structure learners and feature selectors can share estimates for the same data matrix. The cache is bound to
+    the data matrix and the optional parameters for MI estimation on first use, and raises ``ValueError`` if it is used
+    with others. The target of feature selection is not part of the binding; when it changes, the estimates which
+    involve it are discarded, and those only between the features are kept. The data matrix is validated and its
+    column types are detected once on binding, or taken from a :class:`Dataset` if given, so that estimates are
+    computed without repeated validation.
+
+    Since the key is symmetric, an estimate of CMI between ``i`` and ``j`` is reused for CMI between ``j`` and ``i``.
+    Estimators computing CMI as the difference of two MI estimates are not exactly symmetric, so that results with the
+    cache may slightly differ from those without it. Estimates in ``disk_cache`` are keyed in the order of arguments
+    for such estimators, so that those found there are the same as estimated. When structure learners run in
+    parallel processes, each process works on a cache of its own, whose estimates are added to this one afterwards.
+
+    Parameters
+    ----------
+    maxsize : int or None, default None
+        Maximum number of estimates. If exceeded, the least recently used estimate is discarded. If ``None``, the cache
+        can grow without bound.
+    disk_cache : DiskCache or None, default None
+        Persistent cache in which estimates missing in memory are looked up before being estimated, and to which new
+        estimates are added, so that they are reused across runs on data with the same columns.
+    """
+
+    def __init__(self, maxsize=None, disk_cache=None):
+        assert maxsize is None or isinstance(maxsize, (int, np.integer)) and maxsize >= 0, \
+            '`maxsize` must be None or a non-negative integer.'
+        assert disk_cache is None or isinstance(disk_cache, DiskCache), \
+            '`disk_cache` must be None or an instance of DiskCache.'
+        self.maxsize = maxsize
+        self.disk_cache = disk_cache
+        self.hits = 0
+        self.misses = 0
+        self._cmis = OrderedDict()
+        self._fingerprint = None
+        self._target_fingerprint = None
+        self._source = None
+        self._target = None
+        self._dataset = None
+        self._kwargs = {}
+        self._hashes = {}
+
+    def __len__(self):
+        return len(self._cmis)
+
+    def cache_info(self):
+        """Report statistics of the cache in the same form as ``functools.lru_cache``."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._cmis))
+
+    def clear(self):
+        """Discard all the estimates and statistics, and unbind the data matrix."""
+        self.hits = 0
+        self.misses = 0
+        self._cmis.clear()
+        self._fingerprint = None
+        self._target_fingerprint = None
+        self._source = None
+        self._target = None
+        self._dataset = None
+        self._kwargs = {}
+        self._hashes = {}
+
+    def bind(self, X, y=None, **kwargs):
+        """Bind the cache to a data matrix and optional parameters for MI estimation.
+
+        Parameters
+        ----------
+        X : array-like, shape (n_samples, n_features) or Dataset
+            Observations of variables.
+        y : array-like, shape (n_samples) or None, default None
+            Observations of an additional variable, such as the target of feature selection, whose index is
+            ``n_features``. If ``X`` is a :class:`Dataset` and ``y`` is ``None``, the additional variable of ``X`` is
+            used.
+        kwargs : dict
+            Optional parameters for MI estimation.
+
+        Returns
+        -------
+        self : CMICache
+            The bound cache.
+        """
+        if X is self._source and y is self._target and kwargs == self._kwargs:
+            return self
+        if not isinstance(X, Dataset):
+            dataset = Dataset(X, y)
+        elif y is None or y is X.y:
+            dataset = X
+        else:
+            dataset = X.with_target(y)
+        if self.maxsize != 0:
+            fingerprint = _fingerprint([dataset.X], kwargs)
+            if self._fingerprint is not None and self._fingerprint != fingerprint:
+                raise ValueError('`cache` is bound to another data matrix or other parameters for MI estimation.')
+            self._fingerprint = fingerprint
+        self._source = X
+        self._target = y
+        self._dataset = dataset
+        self._kwargs = kwargs
+        self._hashes = {}
+        self._check_target(dataset)
+        return self
+
+    def conditional_mutual_information(self, i, j, Z):
+        """Estimate conditional mutual information between columns ``i`` and ``j`` given columns ``Z``."""
+        key = _key(i, j, Z)
+        cmi = self._get(key)
+        if cmi is None:
+            cmi = self._load([(i, j, Z)])[0]
+        if cmi is None:
+            cmi = _estimate_many(self, [(i, j, Z)])[0]
+            self._put(key, cmi)
+            self._store([(i, j, Z)], [cmi])
+        return cmi
+
+    def batch_conditional_mutual_information(self, i, js, Z, candidates_first=False, n_jobs=None):
+        """Estimate conditional mutual information between column ``i`` and each of columns ``js`` given columns
+        ``Z``, estimating only the missing ones with :func:`batch_conditional_mutual_information`.
+
+        If ``n_jobs`` is given, the missing ones are split into chunks estimated in parallel processes."""
+        # Triples are in the order of arguments of each estimate, which is kept in the disk cache.
+        triples = [(j, i, Z) if candidates_first else (i, j, Z) for j in js]
+        cmis = [self._get(_key(*triple)) for triple in triples]
+        self._fill(cmis, triples)
+        missing = [m for m, cmi in enumerate(cmis) if cmi is None]
+        if missing:
+            js_missing = [js[m] for m in missing]
+            estimated = self._map(_estimate_batch, js_missing, n_jobs, i=i, Z=Z, candidates_first=candidates_first)
+            for m, cmi in zip(missing, estimated):
+                cmis[m] = cmi
+                self._put(_key(*triples[m]), cmi)
+            self._store([triples[m] for m in missing], estimated)
+        return np.array(cmis, dtype=float)
+
+    def conditional_mutual_information_many(self, triples, n_jobs=None):
+        """Estimate conditional mutual information for each triple ``(i, j, Z)``, estimating only the missing ones.
+
+        If ``n_jobs`` is given, the missing ones are split into chunks estimated in parallel processes."""
+        cmis = [self._get(_key(*triple)) for triple in triples]
+        self._fill(cmis, triples)
+        missing = [m for m, cmi in enumerate(cmis) if cmi is None]
+        if missing:
+            triples_missing = [triples[m] for m in missing]
+            estimated = self._map(_estimate_many, triples_missing, n_jobs)
+            for m, triple, cmi in zip(missing, triples_missing, estimated):
+                cmis[m] = cmi
+                self._put(_key(*triple), cmi)
+            self._store(triples_missing, estimated)
+        return np.array(cmis, dtype=float)
+
+    def pairwise_mutual_information(self, n_jobs=None):
+        """Estimate mutual information between every pair of columns, estimating with
+        :func:`pairwise_mutual_information` unless all of them are cached."""
+        dataset = self._dataset
+        d = dataset.X.shape[1] + (dataset.y is not None)
+        pairs = [(i, j) for i in range(d) for j in range(i)]
+        mis = [self._get(_key(i, j, ())) for i, j in pairs]
+        self._fill(mis, [(i, j, ()) for i, j in pairs])
+        if any(mi is None for mi in mis):
+            mi = _pairwise_mutual_information(dataset.columns(range(d)), dataset.discrete_of(range(d)), n_jobs=n_jobs,
+                                              **self._kwargs)
+            for i, j in pairs:
+                self._put(_key(i, j, ()), mi[i, j])
+            self._store([(i, j, ()) for i, j in pairs], [mi[i, j] for i, j in pairs])
+            return mi
+        mi = np.zeros([d, d])
+        for (i, j), m in zip(pairs, mis):
+            mi[i, j] = mi[j, i] = m
+        return mi
+
+    def _set_target(self, dataset):
+        # Bind a dataset which differs from the bound one only in the additional variable.
+        self._source = self._dataset = dataset
+        self._target = dataset.y
+        self._check_target(dataset)
+
+    def _check_target(self, dataset):
+        # Discard the estimates which involve the additional variable if it differs from the one they were estimated
+        # with. Binding without it keeps them, since they are not looked up until it is given again.
+        if self.maxsize == 0 or dataset.y is None:
+            return
+        fingerprint = _fingerprint([dataset.y], {})
+        if fingerprint != self._target_fingerprint:
+            d = dataset.X.shape[1]
+            for key in [key for key in self._cmis if d in key[0] or d in key[1]]:
+                del self._cmis[key]
+            self._hashes.pop(d, None)
+            self._target_fingerprint = fingerprint
+
+    def _map(self, func, items, n_jobs, **kwargs):
+        # Apply ``func`` to chunks of ``items`` in parallel processes, to which the data matrix is memory-mapped.
+        n_chunks = min(effective_n_jobs(n_jobs), len(items))
+        if n_chunks <= 1:
+            return func(self, items, **kwargs)
+        bounds = np.linspace(0, len(items), n_chunks + 1).astype(int)
+        chunks = [items[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        results = Parallel(n_jobs=n_jobs)(delayed(_estimate_chunk)(func, self._dataset, self._kwargs, chunk, **kwargs)
+                                          for chunk in chunks)
+        return np.concatenate(results)
+
+    def _map_batches(self, func, items, n_jobs, **kwargs):
+        # Apply ``func`` to each of ``items`` in batches, one per parallel process, so that the data matrix is sent to
+        # each process once instead of this cache to each item. Each process estimates with a cache of its own, and
+        # its estimates are added to this cache.
+        n_batches = min(effective_n_jobs(n_jobs), len(items))
+        if n_batches <= 1:
+            return [func(self, item, **kwargs) for item in items]
+        bounds = np.linspace(0, len(items), n_batches + 1).astype(int)
+        batches = [items[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        results = Parallel(n_jobs=n_jobs)(delayed(_apply_batch)(func, self._dataset, self._kwargs, self.maxsize,
+                                                                self.disk_cache, batch, **kwargs) for batch in batches)
+        for _, cmis in results:
+            for key, cmi in cmis.items():
+                self._put(key, cmi)
+        return [result for batch_results, _ in results for result in batch_results]
+
+    def _fill(self, cmis, triples):
+        # Fill the estimates missing in memory with those found in the disk cache.
+        missing = [m for m, cmi in enumerate(cmis) if cmi is None]
+        if missing:
+            for m, cmi in zip(missing, self._load([triples[m] for m in missing])):
+                cmis[m] = cmi
+
+    def _load(self, triples):
+        # Look up estimates in the disk cache, keeping the found ones in memory as well.
+        if self.disk_cache is None:
+            return [None] * len(triples)
+        cmis = self.disk_cache._get_many([self._disk_key(*triple) for triple in triples])
+        for triple, cmi in zip(triples, cmis):
+            if cmi is not None:
+                self._put(_key(*triple), cmi)
+        return cmis
+
+    def _store(self, triples, cmis):
+        if self.disk_cache is not None:
+            self.disk_cache._put_many([self._disk_key(*triple) for triple in triples], cmis)
+
+    def _disk_key(self, i, j, Z):
+        # Key of the estimate in the same form as those of the public functions, in which the column indices are
+        # replaced with the content hashes of the columns, computed once per column.
+        for k in [i, j] + list(Z):
+            if k not in self._hashes:
+                self._hashes[k] = _hash_column(self._dataset.column(k))
+        dataset = self._dataset
+        symmetric = _symmetric(dataset.discrete_of([i]), dataset.discrete_of([j]), dataset.discrete_of(Z),
+                               **self._kwargs)
+        return _estimate_key([self._hashes[i]], [self._hashes[j]], [self._hashes[k] for k in Z], self._kwargs,
+                             symmetric)
+
+    def _get(self, key):
+        cmi = self._cmis.get(key)
+        if cmi is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._cmis.move_to_end(key)
+        return cmi
+
+    def _put(self, key, cmi):
+        if self.maxsize == 0:
+            return
+        self._cmis[key] = cmi
+        self._cmis.move_to_end(key)
+        if self.maxsize is not None and len(self._cmis) > self.maxsize:
+            self._cmis.popitem(last=False)
+
+
+def _estimate_batch(cache, js, i, Z, candidates_first):
+    dataset = cache._dataset
+    return _batch_conditional_mutual_information(dataset.columns([i]), dataset.columns(js), dataset.columns(Z),
+                                                 dataset.discrete_of([i]), dataset.discrete_of(js),
+                                                 dataset.discrete_of(Z), candidates_first=candidates_first,
+                                                 **cache._kwargs)
+
+
+def _estimate_many(cache, triples):
+    dataset = cache._dataset
+    return np.array([_conditional_mutual_information(dataset.columns([i]), dataset.columns([j]), dataset.columns(Z),
+                                                     dataset.discrete_of([i]), dataset.discrete_of([j]),
+                                                     dataset.discrete_of(Z), **cache._kwargs)
+                     for i, j, Z in triples], dtype=float)
+
+
+def _estimate_chunk(func, dataset, kwargs, chunk, **func_kwargs):
+    return func(CMICache(maxsize=0).bind(dataset, **kwargs), chunk, **func_kwargs)
+
+
+def _apply_batch(func, dataset, kwargs, maxsize, disk_cache, batch, **func_kwargs):
+    cache = CMICache(maxsize, disk_cache).bind(dataset, **kwargs)
+    return [func(cache, item, **func_kwargs) for item in batch], cache._cmis
+
+
+def _key(i, j, Z):
+    return frozenset([i, j]), frozenset(Z)
+
+
+def _fingerprint(arrays, kwargs):
+    h = hashlib.sha1()
+    for a in arrays:
+        h.update(repr((a.shape, a.dtype.str)).encode())
+        # Columns are hashed one by one, which are contiguous in datasets, so that ``X`` is never copied as a whole.
+        for col in np.atleast_2d(a.T):
+            h.update(np.ascontiguousarray(col).data)
+    h.update(repr(_normalize_kwargs(kwargs)).encode())
+    return h.hexdigest()
+
+
+def _check_cache(cache, X, y=None, **kwargs):
+    # Bind the given cache, or a cache which stores nothing if not given.
+    if cache is None:
+        cache = CMICache(maxsize=0)
+    assert isinstance(cache, CMICache), '`cache` must be None or an instance of CMICache.'
+    return cache.bind(X, y, **kwargs)
@@ -0,0 +1,90 @@
+import numpy as np
+from sklearn.utils.validation import check_array
+
+
+class Dataset:
+    """Observations of variables validated once, with column types detected in advance.
+
+    Estimators receiving a dataset skip validation of the observations and detection of discrete columns, which
+    otherwise run on every call, e.g., thousands of times in structure learners. Datasets can be given to
+    :class:`CMICache`, :func:`pairwise_mutual_information`, and the ``select`` functions of
+    :mod:`depynd.feature_selection` and :mod:`depynd.markov_networks` in place of the data matrix.
+
+    ``X`` is converted once to column-major (Fortran) order, so that each column is a contiguous view of it. Arrays
+    already in column-major order are used without a copy, including memory-mapped arrays, e.g., a ``.npy`` file
+    saved from ``np.asfortranarray(X)`` and opened by ``np.load(path, mmap_mode='r')``, which is then never loaded
+    into memory as a whole. Otherwise, ``X`` is copied once. Beyond ``X``, estimation only allocates the columns
+    involved in each estimate and workspace of the estimators, except that pairwise MI sorts a copy of ``X``.
+
+    Parameters
+    ----------
+    X : array-like, shape (n_samples, n_features)
+        Observations of variables.
+    y : array-like, shape (n_samples) or None, default None
+        Observations of an additional variable, such as the target of feature selection, whose index is
+        ``n_features``.
+
+    Attributes
+    ----------
+    X : array, shape (n_samples, n_features)
+        Validated observations of variables in column-major order.
+    y : array, shape (n_samples) or None
+        Validated observations of the additional variable.
+    n_unique : array, shape (n_columns)
+        Number of unique values in each column, followed by that of ``y`` if given.
+    discrete : array, shape (n_columns)
+        Whether each column contains duplicate entries, i.e., is considered discrete if ``is_discrete='auto'``.
+    """
+
+    def __init__(self, X, y=None):
+        X = check_array(X, order='F', ensure_min_samples=2)
+        self.X = X
+        self._n_unique_x = _n_unique(X)
+        self._set_target(y)
+
+    @property
+    def shape(self):
+        """Shape of ``X``."""
+        return self.X.shape
+
+    def with_target(self, y):
+        """Return a dataset with the same ``X`` and another additional variable, validating only ``y``."""
+        dataset = Dataset.__new__(Dataset)
+        dataset.X = self.X
+        dataset._n_unique_x = self._n_unique_x
+        dataset._set_target(y)
+        return dataset
+
+    def column(self, i):
+        """Return the observations of column ``i``, where ``n_features`` refers to ``y``."""
+        return self.y if i == self.X.shape[1] else self.X[:, i]
+
+    def columns(self, indices):
+        """Return the observations of columns ``indices`` as a 2-D array."""
+        indices = list(indices)
+        if indices == list(range(self.X.shape[1])):
+            return self.X
+        if self.y is None or self.X.shape[1] not in indices:
+            return self.X[:, indices]
+        return np.column_stack([self.column(i) for i in indices])
+
+    def discrete_of(self, indices):
+        """Return whether each of columns ``indices`` is discrete as a list."""
+        return self.discrete[list(indices)].tolist()
+
+    def _set_target(self, y):
+        if y is not None:
+            y = check_array(y, ensure_2d=False, ensure_min_samples=2).ravel()
+            assert len(y) == len(self.X), 'X and y must have the same length.'
+        self.y = y
+        self.n_unique = self._n_unique_x if y is None else np.append(self._n_unique_x, _n_unique(y[:, None]))
+        self.discrete = self.n_unique < len(self.X)
+
+
+def _n_unique(X):
+    return np.array([len(np.unique(col)) for col in X.T], dtype=int)
+
+
+def _discrete(X):
+    # Detect columns containing duplicate entries.
+    return (_n_unique(X) < len(X)).tolist()
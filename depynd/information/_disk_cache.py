@@ -0,0 +1,125 @@
+import hashlib
+import os
+import sqlite3
+from contextlib import contextmanager
+
+import numpy as np
+
+# Parameters which do not change estimates are ignored in keys, and the others are compared with defaults filled.
+_IGNORED_KWARGS = ['algorithm', 'working_memory']
+_DEFAULT_KWARGS = {'mi_estimator': 'auto', 'is_discrete': 'auto', 'force_non_negative': False, 'n_neighbors': 3,
+                   'dtype': 'float64', 'sigma': 1, 'n_bases': 200, 'maxiter': 1000, 'centers': 'kmeans',
+                   'solver': 'slsqp', 'reg': 1e-3}
+
+# Maximum number of keys in a single statement, which is below the limit of variables in SQLite.
+_BATCH_SIZE = 500
+
+
+class DiskCache:
+    """Persistent cache of MI and CMI estimates in a SQLite database on disk.
+
+    Estimates are keyed on the content hashes of the columns involved, and the MI estimator with its optional
+    parameters, so that repeated runs on mostly unchanged data skip the estimates whose columns are unchanged. The
+    order of the two conditioned variables is part of the key unless the estimator is exactly symmetric in them, i.e.,
+    unless it is 'plugin', or kNN-based MI without conditioning variables. The
+    cache is given to :func:`mutual_information` and :func:`conditional_mutual_information` as ``disk_cache``, or to
+    :class:`CMICache` to be shared by structure learners and feature selectors. It can be used from several processes
+    at once, and only holds the path to the database, so that it can be pickled.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the database, which is created if it does not exist.
+    maxsize : int or None, default 1000000
+        Maximum number of estimates. If exceeded, the least recently used estimates are discarded. If ``None``, the
+        cache can grow without bound.
+
+    Attributes
+    ----------
+    hits : int
+        Number of estimates found in the cache by this instance.
+    misses : int
+        Number of estimates not found in the cache by this instance.
+    """
+
+    def __init__(self, directory, maxsize=1000000):
+        assert maxsize is None or isinstance(maxsize, (int, np.integer)) and maxsize > 0, \
+            '`maxsize` must be None or a positive integer.'
+        self.directory = directory
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            # ``used`` is a counter increased on every access, which orders estimates from the least recently used.
+            conn.execute('CREATE TABLE IF NOT EXISTS estimates (key TEXT PRIMARY KEY, value REAL, used INTEGER)')
+            conn.execute('CREATE INDEX IF NOT EXISTS estimates_used ON estimates (used)')
+
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute('SELECT COUNT(*) FROM estimates').fetchone()[0]
+
+    def clear(self):
+        """Discard all the estimates in the database and the statistics."""
+        self.hits = 0
+        self.misses = 0
+        with self._connect() as conn:
+            conn.execute('DELETE FROM estimates')
+
+    @contextmanager
+    def _connect(self):
+        # Connect for each transaction, which waits for those of other processes.
+        conn = sqlite3.connect(os.path.join(self.directory, 'estimates.sqlite'), timeout=60)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _get_many(self, keys):
+        found = {}
+        with self._connect() as conn:
+            for start in range(0, len(keys), _BATCH_SIZE):
+                batch = keys[start:start + _BATCH_SIZE]
+                placeholders = ','.join('?' * len(batch))
+                found.update(conn.execute('SELECT key, value FROM estimates WHERE value IS NOT NULL AND key IN (%s)'
+                                          % placeholders, batch).fetchall())
+                conn.execute('UPDATE estimates SET used = (SELECT MAX(used) + 1 FROM estimates) WHERE key IN (%s)'
+                             % placeholders, batch)
+        values = [found.get(key) for key in keys]
+        self.hits += sum(value is not None for value in values)
+        self.misses += sum(value is None for value in values)
+        return values
+
+    def _put_many(self, keys, values):
+        with self._connect() as conn:
+            used = conn.execute('SELECT COALESCE(MAX(used), 0) + 1 FROM estimates').fetchone()[0]
+            conn.executemany('INSERT OR REPLACE INTO estimates VALUES (?, ?, ?)',
+                             [(key, float(value), used) for key, value in zip(keys, values)])
+            if self.maxsize is not None:
+                conn.execute('DELETE FROM estimates WHERE key IN '
+                             '(SELECT key FROM estimates ORDER BY used DESC LIMIT -1 OFFSET ?)', [self.maxsize])
+
+
+def _hash_column(col):
+    h = hashlib.sha1()
+    h.update(repr((col.shape, col.dtype.str)).encode())
+    h.update(np.ascontiguousarray(col).data)
+    return h.hexdigest()
+
+
+def _normalize_kwargs(kwargs):
+    kwargs = dict(_DEFAULT_KWARGS, **{k: v for k, v in kwargs.items() if k not in _IGNORED_KWARGS})
+    kwargs['dtype'] = np.dtype(kwargs['dtype']).name
+    return sorted(kwargs.items())
+
+
+def _estimate_key(hashes_x, hashes_y, hashes_z, kwargs, symmetric):
+    # Key of an estimate, where the columns of the conditioning variable are unordered, and so are the conditioned
+    # variables if the estimator is symmetric in them. MI is keyed as CMI given no columns, so that keys of the public
+    # functions and of CMICache coincide.
+    x, y = tuple(hashes_x), tuple(hashes_y)
+    if symmetric:
+        x, y = min(x, y), max(x, y)
+    key = repr((x, y, tuple(sorted(hashes_z)), _normalize_kwargs(kwargs)))
+    return hashlib.sha1(key.encode()).hexdigest()
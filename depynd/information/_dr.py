@@ -1,10 +1,7 @@
 import numpy as np
-from scipy.stats import multivariate_normal
-from scipy.optimize import minimize
-from sklearn.cluster import KMeans
 
 
-def _mi_dr(X, Y, sigma, n_bases, maxiter):
+def _mi_dr(X, Y, sigma, n_bases, maxiter, centers='kmeans', solver='slsqp', reg=1e-3, dtype=np.float64):
     """Estimate mutual information between X and Y using density ratio estimation.
 
     Parameters
@@ -19,44 +16,101 @@ def _mi_dr(X, Y, sigma, n_bases, maxiter):
         Number of bases used in density ratio estimation.
     maxiter : int
         Maximum number of iteration in density ratio estimation.
+    centers : {'kmeans', 'minibatch', 'random'}, default 'kmeans'
+        How to choose centers of the bases from the samples. 'kmeans' and 'minibatch' use cluster centers of k-means
+        and mini-batch k-means respectively, and 'random' uses samples chosen at random, which is the fastest for
+        large samples.
+    solver : {'slsqp', 'lsmi'}, default 'slsqp'
+        Solver for density ratio estimation. 'slsqp' maximizes the likelihood with SLSQP [suzuki2008approximating]_.
+        'lsmi' fits the density ratio by least squares in closed form [suzuki2009mutual]_, whose coefficients are
+        clipped at zero and normalized in the same way as 'slsqp'.
+    reg : float, default 1e-3
+        Regularization parameter of 'lsmi'.
+    dtype : {np.float64, np.float32}, default np.float64
+        Floating point type of kernels for 'lsmi', which dominate the memory. Products of kernels over samples, i.e.,
+        the matrix of the linear system and the density ratios, are also computed in this type, so as not to copy the
+        kernels. Only the sums of kernels over samples and the solution of the linear system use ``np.float64``
+        regardless. 'slsqp' always uses ``np.float64``, since its line search is sensitive to rounding errors of the
+        objective.
 
     Returns
     -------
     mi : float
         Estimated mutual information between ``X`` and ``Y``.
+
+    References
+    ----------
+    .. [suzuki2008approximating] Suzuki, Taiji, et al. "Approximating mutual information by maximum likelihood
+        density ratio estimation." New challenges for feature selection in data mining and knowledge discovery.
+        2008.
+    .. [suzuki2009mutual] Suzuki, Taiji, et al. "Mutual information estimation reveals global associations between
+        stimuli and biological processes." BMC bioinformatics 10.1 (2009): S52.
     """
     n, d_x = X.shape
     _, d_y = Y.shape
     b = min(n_bases, n)
     XY = np.hstack([X, Y])
-    UV = KMeans(b).fit(XY).cluster_centers_
+    if centers == 'kmeans':
+        from sklearn.cluster import KMeans
+        UV = KMeans(b).fit(XY).cluster_centers_
+    elif centers == 'minibatch':
+        from sklearn.cluster import MiniBatchKMeans
+        UV = MiniBatchKMeans(b).fit(XY).cluster_centers_
+    elif centers == 'random':
+        UV = XY[np.random.choice(n, b, replace=False)]
+    else:
+        raise ValueError('`%s` is not implemented.' % centers)
     U, V = np.split(UV, [d_x], axis=1)
-    phi_x = np.array([_normal(X, u, sigma) for u in U])
-    phi_y = np.array([_normal(Y, v, sigma) for v in V])
+    if solver == 'slsqp':
+        dtype = np.float64
+    # The kernel on the joint space factorizes into kernels on each space, whose products give those of any pairs.
+    phi_x = _gaussian_kernel(U.astype(dtype), X.astype(dtype, copy=False), sigma)
+    phi_y = _gaussian_kernel(V.astype(dtype), Y.astype(dtype, copy=False), sigma)
     phi = phi_x * phi_y
-    h_x = np.sum(phi_x, axis=1)
-    h_y = np.sum(phi_y, axis=1)
-    h_xy = np.sum(phi, axis=1)
+    h_x = np.sum(phi_x, axis=1, dtype=np.float64)
+    h_y = np.sum(phi_y, axis=1, dtype=np.float64)
+    h_xy = np.sum(phi, axis=1, dtype=np.float64)
     h = (h_x * h_y - h_xy) / (n ** 2 - n)
 
-    def fun(alpha):
-        return -np.sum(np.log(alpha.dot(phi)))
+    if solver == 'slsqp':
+        def fun(alpha):
+            return -np.sum(np.log(alpha.dot(phi)))
 
-    def jac(alpha):
-        return -phi.dot(1 / alpha.dot(phi))
+        def jac(alpha):
+            return -phi.dot(1 / alpha.dot(phi))
 
-    x0 = np.random.uniform(0, 1, b)
-    bounds = [(0, None)] * b
-    constraints = [{'type': 'eq', 'fun': lambda alpha: alpha.dot(h) - 1}]
-    result = minimize(fun=fun, jac=jac, x0=x0, bounds=bounds, constraints=constraints, options={'maxiter': maxiter})
+        x0 = np.random.uniform(0, 1, b)
+        bounds = [(0, None)] * b
+        constraints = [{'type': 'eq', 'fun': lambda alpha: alpha.dot(h) - 1}]
+        from scipy.optimize import minimize
+        result = minimize(fun=fun, jac=jac, x0=x0, bounds=bounds, constraints=constraints,
+                          options={'maxiter': maxiter})
+        if not result.success:
+            return np.nan
+        alpha = result.x
+    elif solver == 'lsmi':
+        # Mean of the outer products of bases over pairs of distinct samples, accumulated in the type of the kernels.
+        H = (phi_x.dot(phi_x.T) * phi_y.dot(phi_y.T) - phi.dot(phi.T)).astype(np.float64) / (n ** 2 - n)
+        alpha = np.maximum(np.linalg.solve(H + reg * np.eye(b), h_xy / n), 0)
+        if alpha.dot(h) <= 0:
+            return np.nan
+        alpha /= alpha.dot(h)
+    else:
+        raise ValueError('`%s` is not implemented.' % solver)
 
-    if not result.success:
+    ratio = _ratio(alpha, phi)
+    if np.any(ratio <= 0):
         return np.nan
-
-    mi = np.mean(np.log(result.x.dot(phi)))
+    mi = np.mean(np.log(ratio))
     return mi
 
 
-def _normal(X, mean, sigma):
-    cov = sigma ** 2 * np.eye(len(mean))
-    return multivariate_normal.pdf(X, mean=mean, cov=cov)
+def _ratio(alpha, phi):
+    # Density ratio at each sample, computed in the type of ``phi`` without copying it.
+    return alpha.astype(phi.dtype).dot(phi).astype(np.float64)
+
+
+def _gaussian_kernel(U, X, sigma):
+    # Densities of isotropic normal distributions centered at each row of ``U``, evaluated at each row of ``X``.
+    sq_dists = np.sum(U ** 2, axis=1)[:, None] + np.sum(X ** 2, axis=1) - 2 * U.dot(X.T)
+    return np.exp(-np.maximum(sq_dists, 0) / (2 * sigma ** 2)) / (2 * np.pi * sigma ** 2) ** (U.shape[1] / 2)
@@ -1,10 +1,17 @@
 import numpy as np
+from scipy.special import digamma
 from sklearn.utils.validation import check_array
 
-from depynd.information import _mi_dr, _mi_knn, _mi_plugin
+from depynd._profile import _profiled
+from depynd.information import _mi_dr, _mi_knn, _cmi_knn, _mi_plugin, _cmi_plugin
+from depynd.information._dataset import _discrete
+from depynd.information._disk_cache import DiskCache, _hash_column, _estimate_key
+from depynd.information._knn import _knn_counts_batch, _select_algorithm
+from depynd.information._plugin import _encode, _factorize, _combine, _mi_codes, _cmi_codes
 
 
-def mutual_information(X, Y, mi_estimator='auto', is_discrete='auto', force_non_negative=False, **kwargs):
+def mutual_information(X, Y, mi_estimator='auto', is_discrete='auto', force_non_negative=False, disk_cache=None,
+                       **kwargs):
     """Estimate mutual information between ``X`` and ``Y``.
 
     Parameters
@@ -13,16 +20,25 @@ def mutual_information(X, Y, mi_estimator='auto', is_discrete='auto', force_non_
         Observations of a variable.
     Y : array-like, shape (n_samples, n_features_y) or (n_samples)
         Observations of the other variable.
-    mi_estimator : {'knn', 'dr', 'plugin', 'auto'}, default 'auto'
+    mi_estimator : {'knn', 'knn_cmi', 'dr', 'plugin', 'auto'}, default 'auto'
         MI estimator. If 'auto', MI estimator will be selected depending on whether all features are purely discrete or
         not. If purely discrete, 'plugin' estimator will be used. Otherwise, 'knn' estimator will be selected.
+        'knn_cmi' is equivalent to 'knn' for MI estimation.
     is_discrete : {'auto', bool}, default 'auto'
         If ``bool``, then it determines whether to consider all features purely discrete or not. If 'auto', a column
         which contains duplicate entries will be considered discrete.
     force_non_negative : bool, default False
         If ``True``, the result will be taken max with zero.
+    disk_cache : DiskCache or None, default None
+        Persistent cache of estimates. If given, the estimate is loaded from it if it has been made for columns with
+        the same contents and the same parameters, possibly in another run, and is stored in it otherwise.
     kwargs : dict
-        Optional parameters for MI estimation.
+        Optional parameters for MI estimation. ``dtype`` in {np.float64, np.float32}, default np.float64, is the
+        floating point type of distances in kNN-based estimators with the 'brute' algorithm and of kernels in 'dr'
+        with the 'lsmi' solver. Counts of neighbors and sums of kernels over samples are accumulated in float64
+        regardless, but products of kernels in 'lsmi' are not. With np.float32, kNN-based estimates differ from those
+        with np.float64 only where rounding errors change counts of neighbors, each of which shifts the estimate by at
+        most 1 / n_samples nats, and 'lsmi' estimates differ by about 1e-6.
 
     Returns
     -------
@@ -37,50 +53,18 @@ def mutual_information(X, Y, mi_estimator='auto', is_discrete='auto', force_non_
     Y = check_array(Y, ensure_min_samples=2)
     assert len(X) == len(Y), 'X and Y must have the same length.'
 
-    n = len(X)
-    if is_discrete == 'auto':
-        is_discrete = all(n != len(set(col)) for col in X.T) and all(n != len(set(col)) for col in Y.T)
-        is_continuous = all(n == len(set(col)) for col in X.T) and all(n == len(set(col)) for col in Y.T)
-    elif isinstance(is_discrete, bool):
-        is_continuous = not is_discrete and \
-                        all(n == len(set(col)) for col in X.T) and all(n == len(set(col)) for col in Y.T)
-    else:
-        raise TypeError("`is_discrete` must be 'auto' or bool.")
+    discrete_x, discrete_y = _discrete(X), _discrete(Y)
 
-    if mi_estimator == 'auto':
-        if is_discrete:
-            mi_estimator = 'plugin'
-        # elif is_continuous:  # unstable
-        #     mi_estimator = 'dr'
-        else:
-            mi_estimator = 'knn'
+    def estimate():
+        return _mutual_information(X, Y, discrete_x, discrete_y, mi_estimator, is_discrete, force_non_negative,
+                                   **kwargs)
 
-    if mi_estimator == 'dr':
-        sigma = kwargs.get('sigma', 1)
-        n_bases = kwargs.get('n_bases', 200)
-        maxiter = kwargs.get('maxiter', 1000)
-        assert sigma > 0, '`sigma` must be positive.'
-        assert isinstance(n_bases, (int, np.integer)) and n_bases > 0, '`n_bases` must be a positive integer.'
-        assert isinstance(maxiter, (int, np.integer)) and maxiter > 0, '`maxiter` must be a positive integer.'
-        assert is_continuous, 'When using density ratio estimator, all features must be continuous.'
-        mi = _mi_dr(X, Y, sigma=sigma, n_bases=n_bases, maxiter=maxiter)
-    elif mi_estimator == 'knn':
-        n_neighbors = kwargs.get('n_neighbors', 3)
-        assert isinstance(n_neighbors, (int, np.integer)), '`n_neighbors` must be an integer.'
-        assert n_neighbors > 0, '`n_neighbors` must be positive.'
-        assert n_neighbors < len(X), '`n_neighbors` must be smaller than `n_sample`.'
-        mi = _mi_knn(X, Y, n_neighbors)
-    elif mi_estimator == 'plugin':
-        assert is_discrete, 'When using plug-in estimator, all features must be discrete.'
-        mi = _mi_plugin(X, Y)
-    else:
-        raise ValueError('`%s` is not implemented.' % mi_estimator)
-
-    return max(mi, 0) if force_non_negative else mi
+    params = dict(kwargs, mi_estimator=mi_estimator, is_discrete=is_discrete, force_non_negative=force_non_negative)
+    return _load_or_estimate(disk_cache, [X, Y, X[:, :0]], [discrete_x, discrete_y, []], params, estimate)
 
 
 def conditional_mutual_information(X, Y, Z, mi_estimator='auto', is_discrete='auto', force_non_negative=False,
-                                   **kwargs):
+                                   disk_cache=None, **kwargs):
     """Estimate conditional mutual information between ``X`` and ``Y`` given ``Z``.
 
     Parameters
@@ -91,16 +75,20 @@ def conditional_mutual_information(X, Y, Z, mi_estimator='auto', is_discrete='au
         Observations of the other conditioned variable.
     Z : array-like, shape (n_samples, n_features_z) or (n_samples)
         Observations of the conditioning variable.
-    mi_estimator : {'knn', 'dr', 'plugin', 'auto'}, default 'auto'
+    mi_estimator : {'knn', 'knn_cmi', 'dr', 'plugin', 'auto'}, default 'auto'
         MI estimator. If 'auto', MI estimator will be selected depending on whether all features are purely discrete or
         not. If purely discrete, 'plugin' estimator will be used. Otherwise, 'knn' estimator will be selected.
+        Except for 'knn_cmi' and 'plugin', CMI is computed as the difference of two MI estimates. 'knn_cmi' estimates
+        CMI directly with a single neighbor search in the joint space, and 'plugin' directly from joint entropies.
     is_discrete : {'auto', bool}, default 'auto'
         If ``bool``, then it determines whether to consider all features purely discrete or not. If 'auto', a column
         which contains duplicate entries will be considered discrete.
     force_non_negative : bool, default False
         If ``True``, the result will be taken max with zero.
+    disk_cache : DiskCache or None, default None
+        Persistent cache of estimates. See :func:`mutual_information`.
     kwargs : dict, default None
-        Optional parameters for MI estimation.
+        Optional parameters for MI estimation. See :func:`mutual_information`.
 
     Returns
     -------
@@ -108,12 +96,296 @@ def conditional_mutual_information(X, Y, Z, mi_estimator='auto', is_discrete='au
         Estimated conditional mutual information between ``X`` and ``Y``, given ``Z``.
     """
     if np.size(Z) == 0:
-        return mutual_information(X, Y, mi_estimator, is_discrete, force_non_negative, **kwargs)
+        return mutual_information(X, Y, mi_estimator, is_discrete, force_non_negative, disk_cache, **kwargs)
     assert len(X) == len(Y) == len(Z), 'X, Y and Z must have the same length.'
-    X = np.atleast_2d(X.T).T
-    Z = np.atleast_2d(Z.T).T
+    if is_discrete != 'auto' and not isinstance(is_discrete, bool):
+        raise TypeError("`is_discrete` must be 'auto' or bool.")
+    if np.size(X) == 0 or np.size(Y) == 0:
+        return 0
+    X = check_array(np.atleast_2d(X.T).T, ensure_min_samples=2)
+    Y = check_array(np.atleast_2d(Y.T).T, ensure_min_samples=2)
+    Z = check_array(np.atleast_2d(Z.T).T, ensure_min_samples=2)
+
+    discrete_x, discrete_y, discrete_z = _discrete(X), _discrete(Y), _discrete(Z)
+
+    def estimate():
+        return _conditional_mutual_information(X, Y, Z, discrete_x, discrete_y, discrete_z, mi_estimator,
+                                               is_discrete, force_non_negative, **kwargs)
+
+    params = dict(kwargs, mi_estimator=mi_estimator, is_discrete=is_discrete, force_non_negative=force_non_negative)
+    return _load_or_estimate(disk_cache, [X, Y, Z], [discrete_x, discrete_y, discrete_z], params, estimate)
+
+
+def batch_conditional_mutual_information(x, Y, z, mi_estimator='auto', is_discrete='auto', force_non_negative=False,
+                                         candidates_first=False, **kwargs):
+    """Estimate conditional mutual information between ``x`` and each column of ``Y`` given ``z``.
+
+    The result is the same as ``conditional_mutual_information(x, Y[:, j], z, ...)`` for each column ``j``, but the
+    computation concerning only ``x`` and ``z`` is shared among the candidates. For kNN-based estimators with the
+    'brute' neighbor search, distances among the samples of ``x`` and ``z`` are computed once, and neighbors are
+    counted for all candidates at once. For the plug-in estimator, ``x`` and ``z`` are encoded into integer codes once.
+
+    Parameters
+    ----------
+    x : array-like, shape (n_samples, n_features_x) or (n_samples)
+        Observations of a conditioned variable.
+    Y : array-like, shape (n_samples, n_candidates) or (n_samples)
+        Observations of candidates for the other conditioned variable, one per column.
+    z : array-like, shape (n_samples, n_features_z) or (n_samples)
+        Observations of the conditioning variable.
+    mi_estimator : {'knn', 'knn_cmi', 'dr', 'plugin', 'auto'}, default 'auto'
+        MI estimator. See :func:`conditional_mutual_information`.
+    is_discrete : {'auto', bool}, default 'auto'
+        If ``bool``, then it determines whether to consider all features purely discrete or not. If 'auto', a column
+        which contains duplicate entries will be considered discrete.
+    force_non_negative : bool, default False
+        If ``True``, the result will be taken max with zero.
+    candidates_first : bool, default False
+        If ``True``, the result will be the same as ``conditional_mutual_information(Y[:, j], x, z, ...)`` instead,
+        which differs when CMI is computed as the difference of two MI estimates.
+    kwargs : dict, default None
+        Optional parameters for MI estimation.
+
+    Returns
+    -------
+    cmis : array, shape (n_candidates)
+        Estimated conditional mutual information between ``x`` and each column of ``Y``, given ``z``.
+    """
+    if is_discrete != 'auto' and not isinstance(is_discrete, bool):
+        raise TypeError("`is_discrete` must be 'auto' or bool.")
+    x = np.atleast_2d(x.T).T
+    Y = np.atleast_2d(Y.T).T
+    z = np.atleast_2d(z.T).T
+    assert len(x) == len(Y) == len(z), 'x, Y and z must have the same length.'
+    if np.size(x) == 0 or np.size(Y) == 0:
+        return np.zeros(Y.shape[1])
+    x = check_array(x, ensure_min_samples=2)
+    Y = check_array(Y, ensure_min_samples=2)
+    if np.size(z) > 0:
+        z = check_array(z, ensure_min_samples=2)
+    return _batch_conditional_mutual_information(x, Y, z, _discrete(x), _discrete(Y), _discrete(z), mi_estimator,
+                                                 is_discrete, force_non_negative, candidates_first, **kwargs)
+
+
+def _load_or_estimate(disk_cache, arrays, discrete, params, estimate):
+    # Load the estimate for the columns of ``arrays``, i.e., X, Y and Z, and ``params`` from the disk cache, or call
+    # ``estimate`` and store the result.
+    if disk_cache is None:
+        return estimate()
+    assert isinstance(disk_cache, DiskCache), '`disk_cache` must be None or an instance of DiskCache.'
+    hashes = [[_hash_column(col) for col in A.T] for A in arrays]
+    key = _estimate_key(*hashes, params, _symmetric(*discrete, **params))
+    value = disk_cache._get_many([key])[0]
+    if value is None:
+        value = estimate()
+        disk_cache._put_many([key], [value])
+    return value
+
+
+def _describe_mi(X, Y, discrete_x, discrete_y, mi_estimator='auto', is_discrete='auto', *args, **kwargs):
+    return _select_estimator(mi_estimator, is_discrete, discrete_x + discrete_y)[0], len(X), 0, 1
+
+
+def _describe_cmi(X, Y, Z, discrete_x, discrete_y, discrete_z, mi_estimator='auto', is_discrete='auto', *args,
+                  **kwargs):
+    mi_estimator = _select_estimator(mi_estimator, is_discrete, discrete_x + discrete_y + discrete_z)[0]
+    return mi_estimator, len(X), Z.shape[1], 1
+
+
+def _describe_batch(x, Y, z, discrete_x, discrete_y, discrete_z, mi_estimator='auto', is_discrete='auto', *args,
+                    **kwargs):
+    mi_estimator = _select_estimator(mi_estimator, is_discrete, discrete_x + list(discrete_y) + discrete_z)[0]
+    return mi_estimator, len(x), z.shape[1], Y.shape[1]
+
+
+@_profiled('mutual_information', _describe_mi)
+def _mutual_information(X, Y, discrete_x, discrete_y, mi_estimator='auto', is_discrete='auto',
+                        force_non_negative=False, **kwargs):
+    # Estimate MI between validated 2-D arrays, whose columns are known to be discrete or not.
+    n = len(X)
+    mi_estimator, is_discrete, is_continuous = _select_estimator(mi_estimator, is_discrete, discrete_x + discrete_y)
+
+    if mi_estimator == 'dr':
+        sigma = kwargs.get('sigma', 1)
+        n_bases = kwargs.get('n_bases', 200)
+        maxiter = kwargs.get('maxiter', 1000)
+        centers = kwargs.get('centers', 'kmeans')
+        solver = kwargs.get('solver', 'slsqp')
+        reg = kwargs.get('reg', 1e-3)
+        assert sigma > 0, '`sigma` must be positive.'
+        assert isinstance(n_bases, (int, np.integer)) and n_bases > 0, '`n_bases` must be a positive integer.'
+        assert isinstance(maxiter, (int, np.integer)) and maxiter > 0, '`maxiter` must be a positive integer.'
+        assert centers in ['kmeans', 'minibatch', 'random'], "`centers` must be 'kmeans', 'minibatch' or 'random'."
+        assert solver in ['slsqp', 'lsmi'], "`solver` must be 'slsqp' or 'lsmi'."
+        assert reg >= 0, '`reg` must be non-negative.'
+        assert is_continuous, 'When using density ratio estimator, all features must be continuous.'
+        mi = _mi_dr(X, Y, sigma=sigma, n_bases=n_bases, maxiter=maxiter, centers=centers, solver=solver, reg=reg,
+                    dtype=_check_dtype(**kwargs))
+    elif mi_estimator in ['knn', 'knn_cmi']:
+        n_neighbors, algorithm, working_memory = _check_knn_kwargs(n, **kwargs)
+        mi = _mi_knn(X, Y, n_neighbors, algorithm=algorithm, working_memory=working_memory,
+                     dtype=_check_dtype(**kwargs))
+    elif mi_estimator == 'plugin':
+        assert is_discrete, 'When using plug-in estimator, all features must be discrete.'
+        mi = _mi_plugin(X, Y)
+    else:
+        raise ValueError('`%s` is not implemented.' % mi_estimator)
+
+    return max(mi, 0) if force_non_negative else mi
+
+
+@_profiled('conditional_mutual_information', _describe_cmi)
+def _conditional_mutual_information(X, Y, Z, discrete_x, discrete_y, discrete_z, mi_estimator='auto',
+                                    is_discrete='auto', force_non_negative=False, **kwargs):
+    # Estimate CMI between validated 2-D arrays, whose columns are known to be discrete or not.
+    if Z.shape[1] == 0:
+        return _mutual_information(X, Y, discrete_x, discrete_y, mi_estimator, is_discrete, force_non_negative,
+                                   **kwargs)
+    if X.shape[1] == 0 or Y.shape[1] == 0:
+        return 0
+    if mi_estimator == 'knn_cmi':
+        n_neighbors, algorithm, working_memory = _check_knn_kwargs(len(X), **kwargs)
+        cmi = _cmi_knn(X, Y, Z, n_neighbors, algorithm=algorithm, working_memory=working_memory,
+                       dtype=_check_dtype(**kwargs))
+        return max(cmi, 0) if force_non_negative else cmi
+    if mi_estimator in ['plugin', 'auto']:
+        mi_estimator_, is_discrete_, _ = _select_estimator(mi_estimator, is_discrete,
+                                                           discrete_x + discrete_y + discrete_z)
+        if mi_estimator_ == 'plugin':
+            assert is_discrete_, 'When using plug-in estimator, all features must be discrete.'
+            cmi = _cmi_plugin(X, Y, Z)
+            return max(cmi, 0) if force_non_negative else cmi
     XZ = np.hstack([X, Z])
-    mi_xz_y = mutual_information(XZ, Y, mi_estimator, is_discrete, **kwargs)
-    mi_y_z = mutual_information(Y, Z, mi_estimator, is_discrete, **kwargs)
+    mi_xz_y = _mutual_information(XZ, Y, discrete_x + discrete_z, discrete_y, mi_estimator, is_discrete, **kwargs)
+    mi_y_z = _mutual_information(Y, Z, discrete_y, discrete_z, mi_estimator, is_discrete, **kwargs)
     cmi = mi_xz_y - mi_y_z
     return max(cmi, 0) if force_non_negative else cmi
+
+
+@_profiled('batch_conditional_mutual_information', _describe_batch)
+def _batch_conditional_mutual_information(x, Y, z, discrete_x, discrete_y, discrete_z, mi_estimator='auto',
+                                          is_discrete='auto', force_non_negative=False, candidates_first=False,
+                                          **kwargs):
+    # Estimate CMI for each candidate with validated 2-D arrays, whose columns are known to be discrete or not.
+    if x.shape[1] == 0 or Y.shape[1] == 0:
+        return np.zeros(Y.shape[1])
+    n = len(x)
+    discrete_y = np.array(discrete_y, dtype=bool)
+    brute = _select_algorithm(kwargs.get('algorithm', 'auto'), n) == 'brute'
+    if np.size(z) > 0 and _select_estimator(mi_estimator, is_discrete, discrete_x + discrete_z + [True])[0] == 'plugin':
+        codes_x, codes_z = _encode(x), _encode(z)
+    cmis = np.empty(Y.shape[1])
+    # Estimators are selected per candidate, which only depends on whether the candidate is discrete or not.
+    for discrete in [False, True]:
+        js = np.flatnonzero(discrete_y == discrete)
+        if len(js) == 0:
+            continue
+        discrete_all = discrete_x + discrete_z + [discrete]
+        mi_estimator_, is_discrete_, _ = _select_estimator(mi_estimator, is_discrete, discrete_all)
+        if np.size(z) == 0:
+            cmis[js] = _batch_mi(x, discrete_x, Y[:, js], discrete, mi_estimator, is_discrete, candidates_first,
+                                 **kwargs)
+        elif mi_estimator == 'knn_cmi' and brute:
+            n_neighbors, _, working_memory = _check_knn_kwargs(n, **kwargs)
+            subspaces = [[0, 1], [2, 1], [1]]
+            ks, (n_xz, n_yz, n_z) = _knn_counts_batch([x, z], Y[:, js], subspaces, n_neighbors, working_memory,
+                                                      dtype=_check_dtype(**kwargs))
+            cmis[js] = np.mean(digamma(ks) - digamma(n_xz) - digamma(n_yz) + digamma(n_z), axis=0)
+        elif mi_estimator == 'knn_cmi':
+            for j in js:
+                xy = (Y[:, [j]], x) if candidates_first else (x, Y[:, [j]])
+                discrete_xy = ([discrete], discrete_x) if candidates_first else (discrete_x, [discrete])
+                cmis[j] = _conditional_mutual_information(*xy, z, *discrete_xy, discrete_z, mi_estimator, is_discrete,
+                                                          **kwargs)
+        elif mi_estimator_ == 'plugin':
+            assert is_discrete_, 'When using plug-in estimator, all features must be discrete.'
+            for j in js:
+                codes_y = _factorize(Y[:, j])
+                xy = (codes_y, codes_x) if candidates_first else (codes_x, codes_y)
+                cmis[j] = _cmi_codes(*xy, codes_z)
+        elif candidates_first:
+            mi_yz_x = _batch_mi(x, discrete_x, Y[:, js], discrete, mi_estimator, is_discrete, True, attached=z,
+                                discrete_attached=discrete_z, **kwargs)
+            mi_x_z = _mutual_information(x, z, discrete_x, discrete_z, mi_estimator, is_discrete, **kwargs)
+            cmis[js] = mi_yz_x - mi_x_z
+        else:
+            xz = np.hstack([x, z])
+            mi_xz_y = _batch_mi(xz, discrete_x + discrete_z, Y[:, js], discrete, mi_estimator, is_discrete, False,
+                                **kwargs)
+            mi_y_z = _batch_mi(z, discrete_z, Y[:, js], discrete, mi_estimator, is_discrete, True, **kwargs)
+            cmis[js] = mi_xz_y - mi_y_z
+    return np.maximum(cmis, 0) if force_non_negative else cmis
+
+
+def _batch_mi(x, discrete_x, Y, discrete_y, mi_estimator, is_discrete, candidates_first, attached=None,
+              discrete_attached=(), **kwargs):
+    # Estimate MI between ``x`` and each candidate, optionally concatenated with ``attached``.
+    n = len(x)
+    discrete = discrete_x + [discrete_y] + list(discrete_attached)
+    mi_estimator_, is_discrete_, _ = _select_estimator(mi_estimator, is_discrete, discrete)
+    if mi_estimator_ == 'plugin':
+        assert is_discrete_, 'When using plug-in estimator, all features must be discrete.'
+        codes_x = _encode(x)
+        codes_attached = None if attached is None else _encode(attached)
+        mis = np.empty(Y.shape[1])
+        for j, y in enumerate(Y.T):
+            codes_y = _factorize(y) if attached is None else _combine(_factorize(y), codes_attached)
+            mis[j] = _mi_codes(codes_y, codes_x) if candidates_first else _mi_codes(codes_x, codes_y)
+        return mis
+    if mi_estimator_ in ['knn', 'knn_cmi'] and _select_algorithm(kwargs.get('algorithm', 'auto'), n) == 'brute':
+        n_neighbors, _, working_memory = _check_knn_kwargs(n, **kwargs)
+        ks, (n_x, n_y) = _knn_counts_batch([x], Y, [[0], [1]], n_neighbors, working_memory, attached=attached,
+                                           dtype=_check_dtype(**kwargs))
+        return np.log(n) + np.mean(digamma(ks) - np.log(n_x * n_y), axis=0)
+    mis = np.empty(Y.shape[1])
+    discrete_y = [discrete_y] + list(discrete_attached)
+    for j, y in enumerate(Y.T):
+        y = y[:, None] if attached is None else np.hstack([y[:, None], attached])
+        xy = (y, x) if candidates_first else (x, y)
+        discrete_xy = (discrete_y, discrete_x) if candidates_first else (discrete_x, discrete_y)
+        mis[j] = _mutual_information(*xy, *discrete_xy, mi_estimator=mi_estimator, is_discrete=is_discrete, **kwargs)
+    return mis
+
+
+def _symmetric(discrete_x, discrete_y, discrete_z, mi_estimator='auto', is_discrete='auto', **kwargs):
+    # Whether estimates are exactly symmetric in X and Y. Plug-in estimates and kNN estimates of MI are, but CMI
+    # computed as the difference of two MI estimates and DR estimates are not.
+    mi_estimator = _select_estimator(mi_estimator, is_discrete, discrete_x + discrete_y + discrete_z)[0]
+    return mi_estimator == 'plugin' or mi_estimator in ['knn', 'knn_cmi'] and len(discrete_z) == 0
+
+
+def _select_estimator(mi_estimator, is_discrete, discrete):
+    if is_discrete == 'auto':
+        is_discrete = all(discrete)
+        is_continuous = not any(discrete)
+    elif isinstance(is_discrete, bool):
+        is_continuous = not is_discrete and not any(discrete)
+    else:
+        raise TypeError("`is_discrete` must be 'auto' or bool.")
+
+    if mi_estimator == 'auto':
+        if is_discrete:
+            mi_estimator = 'plugin'
+        # elif is_continuous:  # unstable
+        #     mi_estimator = 'dr'
+        else:
+            mi_estimator = 'knn'
+    return mi_estimator, is_discrete, is_continuous
+
+
+def _check_knn_kwargs(n, **kwargs):
+    n_neighbors = kwargs.get('n_neighbors', 3)
+    algorithm = kwargs.get('algorithm', 'auto')
+    working_memory = kwargs.get('working_memory', None)
+    assert isinstance(n_neighbors, (int, np.integer)), '`n_neighbors` must be an integer.'
+    assert n_neighbors > 0, '`n_neighbors` must be positive.'
+    assert n_neighbors < n, '`n_neighbors` must be smaller than `n_sample`.'
+    assert algorithm in ['brute', 'tree', 'auto'], "`algorithm` must be 'brute', 'tree' or 'auto'."
+    assert working_memory is None or working_memory > 0, '`working_memory` must be positive.'
+    return n_neighbors, algorithm, working_memory
+
+
+def _check_dtype(**kwargs):
+    dtype = np.dtype(kwargs.get('dtype', np.float64))
+    assert dtype in [np.float32, np.float64], '`dtype` must be float32 or float64.'
+    return dtype
@@ -1,8 +1,13 @@
+from functools import reduce
+
 import numpy as np
 from scipy.special import digamma
 
+# Distances up to which samples are tied, i.e., the absolute tolerance of ``np.isclose(distance, 0)``.
+_ATOL = 1e-8
+
 
-def _mi_knn(X, Y, n_neighbors):
+def _mi_knn(X, Y, n_neighbors, algorithm='auto', working_memory=None, dtype=np.float64):
     """Estimate mutual information between X and Y using kNN-based MI estimator.
 
     Parameters
@@ -13,22 +18,311 @@ def _mi_knn(X, Y, n_neighbors):
         Observations of the other variable.
     n_neighbors : int
         Number of neighbors.
+    algorithm : {'brute', 'tree', 'auto'}, default 'auto'
+        Algorithm used to search neighbors. 'brute' computes all pairwise distances, which requires O(n_samples^2)
+        memory. 'tree' uses KD-trees, which requires O(n_samples) memory if every variable is one-dimensional.
+        Otherwise, the pairs of samples within a bound of the search radius are kept at once, which requires memory
+        proportional to their number, up to O(n_samples^2) on discrete or heavily tied data. If 'auto', 'tree' will
+        be used for more than 1000 samples.
+    working_memory : int or None, default None
+        Maximum memory in MiB used by the 'brute' algorithm. Distances are computed for blocks of samples which fit in
+        this budget. If None, ``sklearn.get_config()['working_memory']`` will be used.
+    dtype : {np.float64, np.float32}, default np.float64
+        Floating point type of distances computed by the 'brute' algorithm. ``np.float32`` halves the memory of
+        distances, and thus doubles the number of samples in each block. KD-trees always use ``np.float64``.
 
     Returns
     -------
     mi : float
         Estimated mutual information between ``X`` and ``Y``.
     """
-    n, d_x = X.shape
-    _, d_y = Y.shape
-    distances_x = np.linalg.norm(X - X.reshape([n, -1, d_x]), axis=2)
-    distances_y = np.linalg.norm(Y - Y.reshape([n, -1, d_y]), axis=2)
-    distances = np.maximum(distances_x, distances_y)
-    epsilons = np.partition(distances, n_neighbors, axis=1)[:, n_neighbors]
-    idx_discrete = np.isclose(epsilons, 0)
+    n = len(X)
+    ks, (n_x, n_y) = _knn_counts([X, Y], [[0], [1]], n_neighbors, algorithm, working_memory, dtype)
+    mi = np.log(n) + np.mean(digamma(ks) - np.log(n_x * n_y))
+    return mi
+
+
+def _cmi_knn(X, Y, Z, n_neighbors, algorithm='auto', working_memory=None, dtype=np.float64):
+    """Estimate conditional mutual information between X and Y given Z using kNN-based CMI estimator
+    [frenzel2007partial]_.
+
+    Parameters
+    ----------
+    X : array-like, shape (n_samples, n_features_x)
+        Observations of a conditioned variable.
+    Y : array-like, shape (n_samples, n_features_y)
+        Observations of the other conditioned variable.
+    Z : array-like, shape (n_samples, n_features_z)
+        Observations of the conditioning variable.
+    n_neighbors : int
+        Number of neighbors.
+    algorithm : {'brute', 'tree', 'auto'}, default 'auto'
+        Algorithm used to search neighbors. See :func:`_mi_knn`.
+    working_memory : int or None, default None
+        Maximum memory in MiB used by the 'brute' algorithm. See :func:`_mi_knn`.
+    dtype : {np.float64, np.float32}, default np.float64
+        Floating point type of distances computed by the 'brute' algorithm. See :func:`_mi_knn`.
+
+    Returns
+    -------
+    cmi : float
+        Estimated conditional mutual information between ``X`` and ``Y`` given ``Z``.
+
+    References
+    ----------
+    .. [frenzel2007partial] Frenzel, Stefan, and Bernd Pompe. "Partial mutual information for coupling analysis of
+        multivariate time series." Physical review letters 99.20 (2007): 204101.
+    """
+    ks, (n_xz, n_yz, n_z) = _knn_counts([X, Y, Z], [[0, 2], [1, 2], [2]], n_neighbors, algorithm, working_memory,
+                                        dtype)
+    cmi = np.mean(digamma(ks) - digamma(n_xz) - digamma(n_yz) + digamma(n_z))
+    return cmi
+
+
+def _knn_counts(blocks, subspaces, n_neighbors, algorithm, working_memory=None, dtype=np.float64):
+    """Count neighbors of each sample for kNN-based estimators.
+
+    The distance in the joint space is the maximum of the Euclidean distances in each block. For each sample, the
+    distance to its ``n_neighbors``-th neighbor in the joint space is used as the radius for counting neighbors in each
+    subspace.
+
+    Parameters
+    ----------
+    blocks : list of arrays, shape (n_samples, n_features_b)
+        Observations of variables spanning the joint space.
+    subspaces : list of lists of int
+        Indices of ``blocks`` spanning each subspace.
+    n_neighbors : int
+        Number of neighbors.
+    algorithm : {'brute', 'tree', 'auto'}
+        Algorithm used to search neighbors.
+    working_memory : int or None, default None
+        Maximum memory in MiB used by the 'brute' algorithm.
+    dtype : {np.float64, np.float32}, default np.float64
+        Floating point type of distances computed by the 'brute' algorithm.
+
+    Returns
+    -------
+    ks : array, shape (n_samples)
+        Number of neighbors in the joint space, which can be larger than ``n_neighbors`` on ties at distance zero.
+    counts : list of arrays, shape (n_samples)
+        Number of neighbors in each subspace, excluding the sample itself.
+    """
+    algorithm = _select_algorithm(algorithm, len(blocks[0]))
+    if algorithm == 'brute':
+        return _knn_counts_brute(blocks, subspaces, n_neighbors, working_memory, dtype)
+    elif algorithm == 'tree':
+        return _knn_counts_tree(blocks, subspaces, n_neighbors)
+    else:
+        raise ValueError('`%s` is not implemented.' % algorithm)
+
+
+def _select_algorithm(algorithm, n_samples):
+    if algorithm == 'auto':
+        return 'tree' if n_samples > 1000 else 'brute'
+    return algorithm
+
+
+def _knn_counts_batch(shared, Y, subspaces, n_neighbors, working_memory=None, attached=None, dtype=np.float64):
+    """Count neighbors of each sample for kNN-based estimators, for many candidate variables at once.
+
+    This is equivalent to calling :func:`_knn_counts` with the 'brute' algorithm and ``shared + [Y[:, [j]]]`` as blocks
+    for each candidate ``j``, but distances in the shared blocks are computed only once.
+
+    Parameters
+    ----------
+    shared : list of arrays, shape (n_samples, n_features_b)
+        Observations of variables common to all candidates.
+    Y : array, shape (n_samples, n_candidates)
+        Observations of candidate variables, one per column. Each candidate is the last block of the joint space.
+    subspaces : list of lists of int
+        Indices of blocks spanning each subspace, where ``len(shared)`` refers to the candidate.
+    n_neighbors : int
+        Number of neighbors.
+    working_memory : int or None, default None
+        Maximum memory in MiB.
+    attached : array, shape (n_samples, n_features_a), default None
+        Observations of variables concatenated to each candidate, i.e., the candidate block will be
+        ``np.hstack([Y[:, [j]], attached])``.
+    dtype : {np.float64, np.float32}, default np.float64
+        Floating point type of distances.
+
+    Returns
+    -------
+    ks : array, shape (n_samples, n_candidates)
+        Number of neighbors in the joint space.
+    counts : list of arrays, shape (n_samples, n_candidates)
+        Number of neighbors in each subspace, excluding the sample itself.
+    """
+    n, c = Y.shape
+    if attached is None:
+        attached = np.empty([n, 0])
+    shared = [B.astype(dtype, copy=False) for B in shared]
+    Y = Y.astype(dtype, copy=False)
+    attached = attached.astype(dtype, copy=False)
+    # Items per row of a chunk: distances in each shared block, the candidate blocks and the joint space, and the
+    # largest temporaries, i.e., differences in a block or those of the neighbor search.
+    d_max = max([B.shape[1] for B in shared + [attached]])
+    row_items = n * (len(shared) + 1 + 2 * c + max(d_max + 1, 3 * c))
+    chunk_n_rows = _chunk_n_rows(np.dtype(dtype).itemsize * row_items, n, working_memory)
+    ks = np.empty([n, c], dtype=int)
+    counts = [np.empty([n, c], dtype=int) for _ in subspaces]
+    for start in range(0, n, chunk_n_rows):
+        rows = slice(start, start + chunk_n_rows)
+        distances = [_distances(B, rows)[:, :, None] for B in shared]
+        distances_candidates = _squared_differences(Y, rows)
+        distances_candidates += np.sum(_squared_differences(attached, rows), axis=2)[:, :, None]
+        distances.append(np.sqrt(distances_candidates, out=distances_candidates))
+        joint = reduce(np.maximum, distances)
+        epsilons = np.partition(joint, n_neighbors, axis=1)[:, n_neighbors, :]
+        idx_discrete = np.isclose(epsilons, 0)
+        ks[rows] = np.where(idx_discrete, np.sum(joint <= _ATOL, axis=1) - 1, n_neighbors)
+        for count, subspace in zip(counts, subspaces):
+            distances_sub = reduce(np.maximum, [distances[b] for b in subspace])
+            count[rows] = np.sum(distances_sub <= epsilons[:, None, :], axis=1) - 1
+        # Released before the next chunk is computed, so that two chunks are never held at once.
+        del distances, joint, distances_sub
+    return ks, counts
+
+
+def _squared_differences(B, rows):
+    # Squared differences between the samples in ``rows`` and all samples for each feature, squared in place.
+    differences = B[rows, None, :] - B[None, :, :]
+    return np.square(differences, out=differences)
+
+
+def _distances(B, rows):
+    # Euclidean distances between the samples in ``rows`` and all samples, which equal ``np.linalg.norm`` of the
+    # differences without its temporary copies.
+    distances = np.sum(_squared_differences(B, rows), axis=2)
+    return np.sqrt(distances, out=distances)
+
+
+def _chunk_n_rows(row_bytes, n_rows, working_memory=None):
+    # Number of rows processed at once, whose temporaries of ``row_bytes`` each fit in ``working_memory`` MiB.
+    if working_memory is None:
+        from sklearn import get_config
+        working_memory = get_config().get('working_memory', 1024)
+    return int(min(n_rows, max(1, working_memory * 2 ** 20 // row_bytes)))
+
+
+def _knn_counts_brute(blocks, subspaces, n_neighbors, working_memory, dtype=np.float64):
+    n = len(blocks[0])
+    blocks = [B.astype(dtype, copy=False) for B in blocks]
+    # Items per row of a chunk: distances in each block and the joint space, and the largest temporaries, i.e.,
+    # differences in a block or those of the neighbor search.
+    row_items = n * (len(blocks) + 1 + max(max(B.shape[1] for B in blocks) + 1, 3))
+    chunk_n_rows = _chunk_n_rows(np.dtype(dtype).itemsize * row_items, n, working_memory)
     ks = np.repeat(n_neighbors, n)
-    ks[idx_discrete] = np.sum(np.isclose(distances[idx_discrete], 0), axis=1) - 1
-    n_x = np.sum(distances_x <= epsilons, axis=0) - 1
-    n_y = np.sum(distances_y <= epsilons, axis=0) - 1
+    counts = [np.empty(n, dtype=int) for _ in subspaces]
+    for start in range(0, n, chunk_n_rows):
+        rows = slice(start, start + chunk_n_rows)
+        distances = [_distances(B, rows) for B in blocks]
+        joint = reduce(np.maximum, distances)
+        epsilons = np.partition(joint, n_neighbors, axis=1)[:, n_neighbors]
+        idx_discrete = np.isclose(epsilons, 0)
+        ks[rows] = np.where(idx_discrete, np.sum(joint <= _ATOL, axis=1) - 1, n_neighbors)
+        for count, subspace in zip(counts, subspaces):
+            distances_sub = reduce(np.maximum, [distances[b] for b in subspace])
+            count[rows] = np.sum(distances_sub <= epsilons[:, None], axis=1) - 1
+        # Released before the next chunk is computed, so that two chunks are never held at once.
+        del distances, joint, distances_sub
+    return ks, counts
+
+
+def _mi_knn_sorted(x, y, x_sorted, y_sorted, n_neighbors):
+    """Estimate mutual information between one-dimensional x and y using kNN-based MI estimator.
+
+    Neighbors in the marginal spaces are counted by binary search on the sorted observations ``x_sorted`` and
+    ``y_sorted``, which can be shared among many pairs of variables. The result is the same as :func:`_mi_knn`.
+    """
+    n = len(x)
+    ks, epsilons = _knn_chebyshev(np.vstack([x, y]).T, n_neighbors)
+    n_x = _count_sorted(x_sorted, x, epsilons) - 1
+    n_y = _count_sorted(y_sorted, y, epsilons) - 1
     mi = np.log(n) + np.mean(digamma(ks) - np.log(n_x * n_y))
     return mi
+
+
+def _knn_chebyshev(joint, n_neighbors):
+    from sklearn.neighbors import KDTree
+    tree = KDTree(joint, metric='chebyshev')
+    epsilons = tree.query(joint, k=n_neighbors + 1)[0][:, -1]
+    idx_discrete = np.isclose(epsilons, 0)
+    ks = np.repeat(n_neighbors, len(joint))
+    if np.any(idx_discrete):
+        ks[idx_discrete] = tree.query_radius(joint[idx_discrete], 1e-8, count_only=True) - 1
+    return ks, epsilons
+
+
+def _count_sorted(x_sorted, x, radii):
+    # Count the observations within each radius by binary search. As ``x -+ radii`` may be rounded, the boundaries are
+    # corrected so that the result is exactly the same as comparing ``np.abs(x_sorted - x)`` with ``radii``.
+    n = len(x_sorted)
+    lo = np.searchsorted(x_sorted, x - radii, side='left')
+    hi = np.searchsorted(x_sorted, x + radii, side='right')
+    while True:
+        extend_lo = (lo > 0) & (np.abs(x_sorted[np.maximum(lo - 1, 0)] - x) <= radii)
+        shrink_lo = np.abs(x_sorted[np.minimum(lo, n - 1)] - x) > radii
+        extend_hi = (hi < n) & (np.abs(x_sorted[np.minimum(hi, n - 1)] - x) <= radii)
+        shrink_hi = np.abs(x_sorted[np.maximum(hi - 1, 0)] - x) > radii
+        if not np.any(extend_lo | shrink_lo | extend_hi | shrink_hi):
+            return hi - lo
+        lo[extend_lo] = np.searchsorted(x_sorted, x_sorted[lo[extend_lo] - 1], side='left')
+        lo[shrink_lo] = np.searchsorted(x_sorted, x_sorted[lo[shrink_lo]], side='right')
+        hi[extend_hi] = np.searchsorted(x_sorted, x_sorted[hi[extend_hi]], side='right')
+        hi[shrink_hi] = np.searchsorted(x_sorted, x_sorted[hi[shrink_hi] - 1], side='left')
+
+
+def _knn_counts_tree(blocks, subspaces, n_neighbors):
+    from sklearn.neighbors import KDTree
+    n = len(blocks[0])
+    joint = np.hstack(blocks)
+    ks = np.repeat(n_neighbors, n)
+    if all(B.shape[1] == 1 for B in blocks):
+        # The joint distance coincides with the Chebyshev distance.
+        ks, epsilons = _knn_chebyshev(joint, n_neighbors)
+    else:
+        # The joint distance is bounded by the Euclidean distance in the joint space, which is in turn bounded by
+        # sqrt(n_blocks) times the joint distance. The k-th neighbor is searched among the candidates in that ball.
+        tree = KDTree(joint)
+        bounds = tree.query(joint, k=n_neighbors + 1)[0][:, -1]
+        rows, cols = _pairs_within(tree, joint, _euclidean_radii(bounds, len(blocks)))
+        distances = _max_norm(blocks, rows, cols)
+        order = np.lexsort((distances, rows))
+        rows, distances = rows[order], distances[order]
+        epsilons = distances[np.searchsorted(rows, np.arange(n)) + n_neighbors]
+        idx_discrete = np.isclose(epsilons, 0)
+        n_zeros = np.bincount(rows[np.isclose(distances, 0)], minlength=n)
+        ks[idx_discrete] = n_zeros[idx_discrete] - 1
+    counts = [_count_within([blocks[b] for b in subspace], epsilons) - 1 for subspace in subspaces]
+    return ks, counts
+
+
+def _count_within(blocks, radii):
+    from sklearn.neighbors import KDTree
+    X = np.hstack(blocks)
+    if all(B.shape[1] == 1 for B in blocks):
+        return KDTree(X, metric='chebyshev').query_radius(X, radii, count_only=True)
+    # Candidates within the enlarged radii are filtered by the same norms as the 'brute' algorithm, so that ties at
+    # the radii are counted in the same way.
+    tree = KDTree(X)
+    rows, cols = _pairs_within(tree, X, _euclidean_radii(radii, len(blocks)))
+    within = _max_norm(blocks, rows, cols) <= radii[rows]
+    return np.bincount(rows[within], minlength=len(X))
+
+
+def _euclidean_radii(radii, n_blocks):
+    # Slightly enlarged so that rounding errors never drop a candidate; candidates are filtered exactly afterwards.
+    return np.sqrt(n_blocks) * (radii * (1 + 1e-6) + 1e-8)
+
+
+def _pairs_within(tree, X, radii):
+    indices = tree.query_radius(X, radii)
+    rows = np.repeat(np.arange(len(X)), [len(idx) for idx in indices])
+    cols = np.concatenate(indices)
+    return rows, cols
+
+
+def _max_norm(blocks, rows, cols):
+    return reduce(np.maximum, [np.linalg.norm(B[rows] - B[cols], axis=1) for B in blocks])
@@ -0,0 +1,89 @@
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.utils.validation import check_array
+
+from depynd._profile import _profiled, _inherit_depth
+from depynd.information._dataset import Dataset, _discrete
+from depynd.information._information import _mutual_information, _select_estimator, _check_knn_kwargs
+from depynd.information._knn import _mi_knn_sorted
+from depynd.information._plugin import _factorize, _mi_codes
+
+
+def pairwise_mutual_information(X, mi_estimator='auto', is_discrete='auto', force_non_negative=False, n_jobs=None,
+                                **kwargs):
+    """Estimate mutual information between every pair of columns in ``X``.
+
+    The result is the same as ``mutual_information(X[:, i], X[:, j], ...)`` for each pair, but each column is
+    preprocessed only once: column types are detected, columns are encoded into integer codes for the plug-in estimator,
+    and columns are sorted for counting neighbors by binary search in the kNN-based estimator. Only pairs with
+    ``i > j`` are estimated.
+
+    Parameters
+    ----------
+    X : array-like, shape (n_samples, n_features) or Dataset
+        Observations of variables. If a :class:`Dataset` is given, its validated observations and column types are
+        used, where its additional variable ``y`` is ignored.
+    mi_estimator : {'knn', 'knn_cmi', 'dr', 'plugin', 'auto'}, default 'auto'
+        MI estimator. See :func:`mutual_information`. The kNN-based estimator always searches neighbors in the joint
+        space with KD-trees, which gives the same result as the 'brute' algorithm.
+    is_discrete : {'auto', bool}, default 'auto'
+        If ``bool``, then it determines whether to consider all features purely discrete or not. If 'auto', a column
+        which contains duplicate entries will be considered discrete.
+    force_non_negative : bool, default False
+        If ``True``, the result will be taken max with zero.
+    n_jobs : int or None, default None
+        Number of threads estimating pairs in parallel. ``None`` means 1 unless in a ``joblib.parallel_backend``
+        context, and -1 means using all processors.
+    kwargs : dict
+        Optional parameters for MI estimation.
+
+    Returns
+    -------
+    mi : array, shape (n_features, n_features)
+        Symmetric matrix of estimated mutual information, whose diagonal elements are zero.
+    """
+    if isinstance(X, Dataset):
+        discrete = X.discrete_of(range(X.shape[1]))
+        X = X.X
+    else:
+        X = check_array(X, ensure_min_samples=2)
+        discrete = _discrete(X)
+    return _pairwise_mutual_information(X, discrete, mi_estimator, is_discrete, force_non_negative, n_jobs, **kwargs)
+
+
+def _describe_pairwise(X, discrete, mi_estimator='auto', is_discrete='auto', *args, **kwargs):
+    d = X.shape[1]
+    return _select_estimator(mi_estimator, is_discrete, discrete)[0], len(X), 0, d * (d - 1) // 2
+
+
+@_profiled('pairwise_mutual_information', _describe_pairwise)
+def _pairwise_mutual_information(X, discrete, mi_estimator='auto', is_discrete='auto', force_non_negative=False,
+                                 n_jobs=None, **kwargs):
+    # Estimate MI between every pair of columns of a validated array, whose columns are known to be discrete or not.
+    n, d = X.shape
+    if is_discrete != 'auto' and not isinstance(is_discrete, bool):
+        raise TypeError("`is_discrete` must be 'auto' or bool.")
+    codes = [_factorize(col) for col in X.T]
+    X_sorted = np.sort(X, axis=0).T
+
+    def estimate(i, j):
+        mi_estimator_, is_discrete_, _ = _select_estimator(mi_estimator, is_discrete, [discrete[i], discrete[j]])
+        if mi_estimator_ == 'plugin':
+            assert is_discrete_, 'When using plug-in estimator, all features must be discrete.'
+            return _mi_codes(codes[i], codes[j])
+        elif mi_estimator_ in ['knn', 'knn_cmi']:
+            n_neighbors, _, _ = _check_knn_kwargs(n, **kwargs)
+            return _mi_knn_sorted(X[:, i], X[:, j], X_sorted[i], X_sorted[j], n_neighbors)
+        return _mutual_information(X[:, [i]], X[:, [j]], [discrete[i]], [discrete[j]], mi_estimator, is_discrete,
+                                   **kwargs)
+
+    def estimate_row(i):
+        return [estimate(i, j) for j in range(i)]
+
+    # Estimators called in the threads are nested in this call, so that they are not recorded separately in profiles.
+    estimate_row = _inherit_depth(estimate_row)
+    rows = Parallel(n_jobs=n_jobs, prefer='threads')(delayed(estimate_row)(i) for i in range(d))
+    mi = np.zeros([d, d])
+    for i, row in enumerate(rows):
+        mi[i, :i] = mi[:i, i] = row
+    return np.maximum(mi, 0) if force_non_negative else mi
@@ -2,12 +2,75 @@ import numpy as np
 
 
 def _mi_plugin(X, Y):
-    XY = np.hstack([X, Y])
-    return _entropy_plugin(X) + _entropy_plugin(Y) - _entropy_plugin(XY)
+    return _mi_codes(_encode(X), _encode(Y))
+
+
+def _cmi_plugin(X, Y, Z):
+    return _cmi_codes(_encode(X), _encode(Y), _encode(Z))
 
 
 def _entropy_plugin(X):
-    n, d = X.shape
-    _, cnt = np.unique(X, axis=0, return_counts=True)
-    p = cnt / n
+    return _entropy_codes(_encode(X))
+
+
+def _mi_codes(codes_x, codes_y):
+    n_x, n_y = _counts(codes_x), _counts(codes_y)
+    n_xy = _counts(_combine(codes_x, codes_y))
+    return np.mean(np.log(len(n_xy) * n_xy / (n_x * n_y)))
+
+
+def _cmi_codes(codes_x, codes_y, codes_z):
+    codes_xz = _combine(codes_x, codes_z)
+    codes_yz = _combine(codes_y, codes_z)
+    n_xz, n_yz, n_z = _counts(codes_xz), _counts(codes_yz), _counts(codes_z)
+    n_xyz = _counts(_combine(codes_x, codes_yz))
+    # Ratios of integer counts are exact, so that conditionally independent samples give exactly zero.
+    return np.mean(np.log(n_xyz * n_z / (n_xz * n_yz)))
+
+
+def _counts(codes):
+    # Count samples sharing the code of each sample.
+    return np.bincount(codes)[codes]
+
+
+def _entropy_codes(codes):
+    cnt = np.bincount(codes)
+    p = cnt[cnt > 0] / len(codes)
     return -np.sum(p * np.log(p))
+
+
+def _factorize(x):
+    # Encode a column into integer codes in the order of its unique values.
+    return np.unique(x, return_inverse=True)[1].ravel()
+
+
+def _encode(X):
+    """Encode each row of ``X`` into an integer code.
+
+    Codes preserve the lexicographic order of rows and are smaller than the number of samples, so that counts of unique
+    rows can be obtained by ``np.bincount`` in the same order as ``np.unique(X, axis=0)``.
+    """
+    return _combine(np.zeros(len(X), dtype=np.int64), *[_factorize(col) for col in X.T])
+
+
+def _combine(*codes):
+    """Combine integer codes of variables into integer codes of the joint variable.
+
+    The codes are combined in mixed radix, which preserves the lexicographic order, and compacted whenever the number of
+    possible codes exceeds the number of samples.
+    """
+    n = len(codes[0])
+    joint = np.zeros(n, dtype=np.int64)
+    n_levels = 1
+    for c in codes:
+        k = int(np.max(c)) + 1 if n > 0 else 1
+        joint = joint * k + c
+        n_levels *= k
+        if n_levels > n:
+            if n_levels <= 16 * n:
+                present = np.bincount(joint, minlength=n_levels) > 0
+                joint = np.cumsum(present)[joint] - 1
+            else:
+                joint = np.unique(joint, return_inverse=True)[1].ravel()
+            n_levels = int(np.max(joint)) + 1
+    return joint
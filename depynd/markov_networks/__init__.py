@@ -1,10 +1,11 @@
 from ._jose import _jose
-from ._skeptic import _skeptic
-from ._glasso import _glasso
+from ._glasso import _glasso, _glasso_path
+from ._skeptic import _skeptic, _skeptic_path
 from ._gsmn import _gsmn
 from ._iamb import _iamb
 from ._gsmple import _gsmple
 from ._stars import _stars
 from ._select import select
 
-__all__ = ['_jose', '_skeptic', '_glasso', '_gsmple', '_gsmn', '_iamb', '_stars', 'select']
+__all__ = ['_jose', '_skeptic', '_skeptic_path', '_glasso', '_glasso_path', '_gsmple', '_gsmn', '_iamb', '_stars',
+           'select']
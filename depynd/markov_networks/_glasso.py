@@ -1,6 +1,6 @@
+from functools import lru_cache
+
 import numpy as np
-from sklearn.preprocessing import scale
-from sklearn.covariance import graph_lasso
 
 
 def _glasso(X, lamb, return_precision=False, **kwargs):
@@ -22,12 +22,52 @@ def _glasso(X, lamb, return_precision=False, **kwargs):
     adj : array, shape (n_features, n_features)
         Estimated adjacency matrix (or precision matrix if ``return_precision`` is True) of an MRF.
     """
+    return next(_glasso_path(X, [lamb], return_precision, **kwargs))
+
+
+def _glasso_path(X, lamb, return_precision=False, **kwargs):
+    """Learn the structures of Markov random field with the graphical lasso for a sequence of regularization parameters.
+
+    The covariance matrix is computed only once, and each problem is solved with a warm start from the solution for
+    the previous regularization parameter. Problems are solved lazily, one per iteration.
+
+    Parameters
+    ----------
+    X : array, shape (n_samples, n_features)
+        Observations of variables.
+    lamb : array-like, shape (n_lambdas)
+        Regularization parameters, which should be in descending order for the warm starts to be effective.
+    return_precision : bool, default False
+        If True, the estimated precision matrices will be returned instead of adjacency matrices.
+
+    Yields
+    ------
+    adj : array, shape (n_features, n_features)
+        Estimated adjacency matrix (or precision matrix if ``return_precision`` is True) of an MRF for each
+        regularization parameter.
+    """
+    from sklearn.preprocessing import scale
     cov = np.cov(scale(X), rowvar=False)
-    kwargs = {k: v for k, v in kwargs.items() if k in graph_lasso.__code__.co_varnames}
-    pre = graph_lasso(cov, alpha=lamb, **kwargs)[1]
-    if return_precision:
-        return pre
-    else:
-        adj = ~np.isclose(pre, 0)
-        adj[np.eye(len(adj), dtype=bool)] = 0
-        return adj
+    _, params = _graph_lasso()
+    kwargs = {k: v for k, v in kwargs.items() if k in params}
+    yield from _graph_lasso_path(cov, lamb, return_precision, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def _graph_lasso():
+    # The implementation in scikit-learn, and the names in its code by which optional parameters are filtered.
+    from sklearn.covariance import graph_lasso
+    return graph_lasso, frozenset(graph_lasso.__code__.co_varnames)
+
+
+def _graph_lasso_path(cov, lamb, return_precision, **kwargs):
+    graph_lasso, _ = _graph_lasso()
+    cov_init = kwargs.pop('cov_init', None)
+    for lam in lamb:
+        cov_init, pre = graph_lasso(cov, alpha=lam, cov_init=cov_init, **kwargs)[:2]
+        if return_precision:
+            yield pre
+        else:
+            adj = ~np.isclose(pre, 0)
+            adj[np.eye(len(adj), dtype=bool)] = 0
+            yield adj
@@ -1,17 +1,24 @@
 import numpy as np
 
-from depynd.information import conditional_mutual_information
+from depynd._profile import _phase
+from depynd.information._cache import _check_cache
 
 
-def _gsmn(X, lamb=0.0, **kwargs):
+def _gsmn(X, lamb=0.0, n_jobs=None, cache=None, **kwargs):
     """Learn the structure of Markov random field with glow-shrink Markov network [bromberg2009efficient]_.
 
     Parameters
     ----------
-    X : array, shape (n_samples, n_features)
+    X : array or Dataset, shape (n_samples, n_features)
         Observations of variables.
     lamb: float
         Threshold for independence tests.
+    n_jobs : int or None, default None
+        Number of processes searching Markov blankets of variables in parallel. ``None`` means 1 unless in a
+        ``joblib.parallel_backend`` context, and -1 means using all processors. Variables are split into one batch
+        per process, so that ``X`` is sent to each process once, through memory mapping if it is large.
+    cache : CMICache or None, default None
+        Cache of CMI estimates, which is shared with the other learners and feature selectors for the same ``X``.
     kwargs : dict, default None
         Optional parameters for MI estimation.
 
@@ -26,26 +33,34 @@ def _gsmn(X, lamb=0.0, **kwargs):
         structure discovery using independence tests." Journal of Artificial Intelligence Research 35 (2009): 449-484.
     """
     n, d = X.shape
+    cache = _check_cache(cache, X, **kwargs)
+    rows = cache._map_batches(_blanket, list(range(d)), n_jobs, d=d, lamb=lamb)
+    # Rows are returned in the order of variables regardless of the order of completion.
     adj = np.zeros([d, d], dtype=bool)
-    for i in range(d):
-        adj_tmp = np.zeros([d, d], dtype=bool)
-        adj_tmp = _grow(adj_tmp, i, X, lamb, **kwargs)
-        adj_tmp = _shrink(adj_tmp, i, X, lamb, **kwargs)
-        adj |= adj_tmp
+    for i, row in enumerate(rows):
+        adj[i] |= row
+        adj[:, i] |= row
     return adj
 
 
-def _grow(adj, i, X, lamb, **kwargs):
-    n, d = X.shape
-    x = X[:, i]
+def _blanket(cache, i, d, lamb):
+    adj = np.zeros([d, d], dtype=bool)
+    with _phase('gsmn.grow'):
+        adj = _grow(adj, i, lamb, cache)
+    with _phase('gsmn.shrink'):
+        adj = _shrink(adj, i, lamb, cache)
+    return adj[i]
+
+
+def _grow(adj, i, lamb, cache):
+    d = len(adj)
     updated = True
     while updated:
         updated = False
         non_adj = ~adj[i] & (np.arange(d) != i)
+        # The search stops at the first dependent candidate, since the conditioning set changes after each addition.
         for j in non_adj.nonzero()[0]:
-            y = X[:, j]
-            z = X[:, adj[i]]
-            cmi = conditional_mutual_information(x, y, z, **kwargs)
+            cmi = cache.conditional_mutual_information(i, j, adj[i].nonzero()[0])
             if cmi > lamb:
                 adj[i, j] = adj[j, i] = 1
                 updated = True
@@ -53,17 +68,14 @@ def _grow(adj, i, X, lamb, **kwargs):
     return adj
 
 
-def _shrink(adj, i, X, lamb, **kwargs):
-    n, d = X.shape
-    x = X[:, i]
+def _shrink(adj, i, lamb, cache):
+    d = len(adj)
     updated = True
     while updated:
         updated = False
         for j in adj[i].nonzero()[0]:
             other_adj = adj[i] & (np.arange(d) != j)
-            y = X[:, j]
-            z = X[:, other_adj]
-            cmi = conditional_mutual_information(x, y, z, **kwargs)
+            cmi = cache.conditional_mutual_information(i, j, other_adj.nonzero()[0])
             if cmi <= lamb:
                 adj[i, j] = adj[j, i] = 0
                 updated = True
@@ -1,18 +1,26 @@
+import heapq
+
 import numpy as np
 
-from depynd.information import mutual_information, conditional_mutual_information
+from depynd._profile import _phase
+from depynd.information._cache import _check_cache
 
 
-def _gsmple(X, lamb=0.0, **kwargs):
+def _gsmple(X, lamb=0.0, n_jobs=None, cache=None, **kwargs):
     """Learn the structure of Markov random field with glow-shrink maximum pseudolikelihood estimation (GS-MPLE)
     [takashina2018structure]_.
 
     Parameters
     ----------
-    X : array, shape (n_samples, n_features)
+    X : array or Dataset, shape (n_samples, n_features)
         Observations of variables.
     lamb: float
         Threshold for independence tests.
+    n_jobs : int or None, default None
+        Number of threads estimating initial pairwise MI in parallel. ``None`` means 1 unless in a
+        ``joblib.parallel_backend`` context, and -1 means using all processors.
+    cache : CMICache or None, default None
+        Cache of CMI estimates, which is shared with the other learners and feature selectors for the same ``X``.
     kwargs : dict, default None
         Optional parameters for MI estimation.
 
@@ -27,71 +35,79 @@ def _gsmple(X, lamb=0.0, **kwargs):
         Maximum Pseudolikelihood Estimation." Eighth International Workshop on Statistical Relational AI (2018).
     """
     n, d = X.shape
+    cache = _check_cache(cache, X, **kwargs)
     adj = np.zeros([d, d], dtype=bool)
-    adj = _grow(adj, X, lamb, **kwargs)
-    adj = _shrink(adj, X, lamb, **kwargs)
+    with _phase('gsmple.grow'):
+        adj = _grow(adj, lamb, cache, n_jobs=n_jobs)
+    with _phase('gsmple.shrink'):
+        adj = _shrink(adj, lamb, cache)
     return adj
 
 
-def _grow(adj, X, lamb, **kwargs):
+def _grow(adj, lamb, cache, n_jobs=None):
     # Initialize CMI cache matrix
-    n, d = X.shape
-    cmis = np.zeros([d, d])
-    cmis[np.eye(d, dtype=bool)] = -np.inf
-    for i in range(d):
-        x = X[:, i]
-        for j in range(i):
-            y = X[:, j]
-            cmis[i, j] = cmis[j, i] = mutual_information(x, y, **kwargs)
-
-    while np.count_nonzero(adj) < d ** 2 - d:
-        scores = cmis + cmis.T
-        imax, jmax = np.unravel_index(np.argmax(scores), scores.shape)
-        if scores[imax, jmax] <= lamb:
+    d = len(adj)
+    cmis = cache.pairwise_mutual_information(n_jobs=n_jobs)
+
+    # Scores of non-adjacent pairs are kept in a heap, whose entries are invalidated lazily when the scores change.
+    heap = [(-_score(cmis, i, j, np.inf), i, j) for i in range(d) for j in range(i + 1, d)]
+    heapq.heapify(heap)
+    while heap:
+        score, imax, jmax = heapq.heappop(heap)
+        if adj[imax, jmax] or -score != _score(cmis, imax, jmax, np.inf):
+            continue
+        if -score <= lamb:
             return adj
         adj[imax, jmax] = adj[jmax, imax] = 1
-        cmis[imax, jmax] = cmis[jmax, imax] = -np.inf
 
-        # Re-compute CMIs
+        # Re-compute CMIs, which only change in the rows of the new edge
+        pairs = []
         for i in (imax, jmax):
-            x = X[:, i]
-            z = X[:, adj[i]]
+            z = adj[i].nonzero()[0]
             non_adj = ~adj[i] & (np.arange(d) != i)
             for j in non_adj.nonzero()[0]:
-                y = X[:, j]
-                cmis[i, j] = conditional_mutual_information(x, y, z, **kwargs)
+                cmis[i, j] = cache.conditional_mutual_information(i, j, z)
+                pairs.append((min(i, j), max(i, j)))
+        for i, j in pairs:
+            heapq.heappush(heap, (-_score(cmis, i, j, np.inf), i, j))
 
     return adj
 
 
-def _shrink(adj, X, lamb, **kwargs):
+def _shrink(adj, lamb, cache):
     # Initialize CMI cache matrix
-    n, d = X.shape
+    d = len(adj)
     cmis = np.zeros([d, d])
-    cmis[np.eye(d, dtype=bool)] = np.inf
     for i in range(d):
-        x = X[:, i]
         for j in adj[i].nonzero()[0]:
             other_adj_i = adj[i] & (np.arange(d) != j)
-            y = X[:, j]
-            z = X[:, other_adj_i]
-            cmis[i, j] = conditional_mutual_information(x, y, z, **kwargs)
-
-    while np.count_nonzero(adj) > 0:
-        scores = cmis + cmis.T
-        imin, jmin = np.unravel_index(np.argmin(scores), scores.shape)
-        if scores[imin, jmin] > lamb:
+            cmis[i, j] = cache.conditional_mutual_information(i, j, other_adj_i.nonzero()[0])
+
+    # Scores of edges are kept in a heap, whose entries are invalidated lazily when the scores change.
+    heap = [(_score(cmis, i, j, -np.inf), i, j) for i, j in zip(*np.triu(adj).nonzero())]
+    heapq.heapify(heap)
+    while heap:
+        score, imin, jmin = heapq.heappop(heap)
+        if not adj[imin, jmin] or score != _score(cmis, imin, jmin, -np.inf):
+            continue
+        if score > lamb:
             return adj
         adj[imin, jmin] = adj[jmin, imin] = 0
-        cmis[imin, jmin] = cmis[jmin, imin] = np.inf
 
-        # Re-compute CMIs
-        for i in range(d):
-            x = X[:, i]
+        # Re-compute CMIs, which only change in the rows of the removed edge
+        pairs = []
+        for i in (imin, jmin):
             for j in adj[i].nonzero()[0]:
                 other_adj_i = adj[i] & (np.arange(d) != j)
-                y = X[:, j]
-                z = X[:, other_adj_i]
-                cmis[i, j] = conditional_mutual_information(x, y, z, **kwargs)
+                cmis[i, j] = cache.conditional_mutual_information(i, j, other_adj_i.nonzero()[0])
+                pairs.append((min(i, j), max(i, j)))
+        for i, j in pairs:
+            heapq.heappush(heap, (_score(cmis, i, j, -np.inf), i, j))
 
     return adj
+
+
+def _score(cmis, i, j, nan):
+    # Symmetrize CMIs of a pair, replacing NaN with ``nan`` so that it is taken first as with argmax and argmin.
+    score = cmis[i, j] + cmis[j, i]
+    return nan if np.isnan(score) else score
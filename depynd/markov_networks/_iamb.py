@@ -1,18 +1,25 @@
 import numpy as np
 
-from depynd.information import conditional_mutual_information
+from depynd._profile import _phase
+from depynd.information._cache import _check_cache
 
 
-def _iamb(X, lamb=0.0, **kwargs):
+def _iamb(X, lamb=0.0, n_jobs=None, cache=None, **kwargs):
     """Learn the structure of Markov random field by finding Markov blanket for each variable with Incremental
     Association Markov Blanket [tsamardinos2003algorithms]_.
 
     Parameters
     ----------
-    X : array, shape (n_samples, n_features)
+    X : array or Dataset, shape (n_samples, n_features)
         Observations of variables.
     lamb: float
         Threshold for independence test.
+    n_jobs : int or None, default None
+        Number of processes searching Markov blankets of variables in parallel. ``None`` means 1 unless in a
+        ``joblib.parallel_backend`` context, and -1 means using all processors. Variables are split into one batch
+        per process, so that ``X`` is sent to each process once, through memory mapping if it is large.
+    cache : CMICache or None, default None
+        Cache of CMI estimates, which is shared with the other learners and feature selectors for the same ``X``.
     kwargs : dict, default None
         Optional parameters for MI estimation.
 
@@ -27,44 +34,48 @@ def _iamb(X, lamb=0.0, **kwargs):
         FLAIRS conference. Vol. 2. 2003.
     """
     n, d = X.shape
+    cache = _check_cache(cache, X, **kwargs)
+    rows = cache._map_batches(_blanket, list(range(d)), n_jobs, d=d, lamb=lamb)
+    # Rows are returned in the order of variables regardless of the order of completion.
     adj = np.zeros([d, d], dtype=bool)
-    for i in range(d):
-        adj_tmp = np.zeros([d, d], dtype=bool)
-        adj_tmp = _grow(adj_tmp, i, X, lamb, **kwargs)
-        adj_tmp = _shrink(adj_tmp, i, X, lamb, **kwargs)
-        adj |= adj_tmp
+    for i, row in enumerate(rows):
+        adj[i] |= row
+        adj[:, i] |= row
     return adj
 
 
-def _grow(adj, i, X, lamb, **kwargs):
-    n, d = X.shape
-    x = X[:, i]
+def _blanket(cache, i, d, lamb):
+    adj = np.zeros([d, d], dtype=bool)
+    with _phase('iamb.grow'):
+        adj = _grow(adj, i, lamb, cache)
+    with _phase('iamb.shrink'):
+        adj = _shrink(adj, i, lamb, cache)
+    return adj[i]
+
+
+def _grow(adj, i, lamb, cache):
+    d = len(adj)
     updated = True
     while updated:
         updated = False
-        vmax = -np.inf
-        z = X[:, adj[i]]
         non_adj = ~adj[i] & (np.arange(d) != i)
-        for j in non_adj.nonzero()[0]:
-            y = X[:, j]
-            cmi = conditional_mutual_information(x, y, z, **kwargs)
-            if vmax < cmi:
-                vmax = cmi
-                imax, jmax = i, j
-        if vmax >= lamb:
-            adj[imax, jmax] = adj[jmax, imax] = 1
+        js = non_adj.nonzero()[0]
+        if len(js) == 0:
+            break
+        cmis = cache.batch_conditional_mutual_information(i, js, adj[i].nonzero()[0])
+        cmis[np.isnan(cmis)] = -np.inf
+        if np.max(cmis) >= lamb:
+            jmax = js[np.argmax(cmis)]
+            adj[i, jmax] = adj[jmax, i] = 1
             updated = True
     return adj
 
 
-def _shrink(adj, i, X, lamb, **kwargs):
-    n, d = X.shape
-    x = X[:, i]
+def _shrink(adj, i, lamb, cache):
+    d = len(adj)
     for j in adj[i].nonzero()[0]:
         other_adj = adj[i] & (np.arange(d) != j)
-        y = X[:, j]
-        z = X[:, other_adj]
-        cmi = conditional_mutual_information(x, y, z, **kwargs)
+        cmi = cache.conditional_mutual_information(i, j, other_adj.nonzero()[0])
         if cmi <= lamb:
             adj[i, j] = adj[j, i] = 0
         if np.count_nonzero(adj[i]) == 0:
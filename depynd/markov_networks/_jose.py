@@ -1,7 +1,5 @@
-from itertools import combinations
-
 import numpy as np
-from sklearn.linear_model import Lasso
+from scipy.sparse import csc_matrix
 
 
 def non_diag(A):
@@ -14,8 +12,15 @@ def _jose(X, lamb=0.01, tol=1e-6, max_iter=100, **kwargs):
     if set(np.ravel(X)) != {0, 1}:
         raise ValueError('Each element of X must be in {0, 1}.')
 
+    from sklearn.linear_model import Lasso
     n, d = X.shape
-    comb = list(combinations(np.arange(d), 2))
+    rows, cols = np.triu_indices(d, 1)
+    # Column k of the design only has non-zeros in the blocks of samples for ``rows[k]`` and ``cols[k]``, so that its
+    # structure is built once and only its values are updated in each iteration.
+    indices = np.hstack([n * rows[:, None] + np.arange(n), n * cols[:, None] + np.arange(n)]).ravel()
+    x = csc_matrix((np.zeros(len(indices)), indices, np.arange(0, len(indices) + 1, 2 * n)), shape=[n * d, len(rows)])
+    # Each fit starts from the coefficients of the previous iteration.
+    lasso = Lasso(lamb, copy_X=False, warm_start=True)
     theta = np.eye(d)
     for _ in range(max_iter):
         theta_prev = np.copy(theta)
@@ -29,14 +34,10 @@ def _jose(X, lamb=0.01, tol=1e-6, max_iter=100, **kwargs):
         x_star = np.sqrt(w) * X
         x_mean = np.mean(x_star, axis=0)
         x_star_star = x_star - x_mean[None, :]
-        x = np.zeros([n * d, d * (d - 1) // 2])
-        for k, (i, j) in enumerate(comb):
-            x[np.arange(n * i, n * (i + 1)), k] = x_star_star[:, j]
-            x[np.arange(n * j, n * (j + 1)), k] = x_star_star[:, i]
+        x.data[:] = np.hstack([x_star_star.T[cols], x_star_star.T[rows]]).ravel()
         y = np.concatenate(y_star_star.T)
-        coef = Lasso(lamb).fit(x, y).coef_
-        for k, (i, j) in enumerate(comb):
-            theta[i, j] = theta[j, i] = coef[k]
+        coef = lasso.fit(x, y).coef_
+        theta[rows, cols] = theta[cols, rows] = coef
         w_mean = np.mean(np.sqrt(w), axis=0)
         theta[np.eye(d, dtype=bool)] = (y_mean - x_mean @ non_diag(theta)) / w_mean
         diff = np.linalg.norm(theta - theta_prev)
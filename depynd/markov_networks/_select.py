@@ -1,16 +1,21 @@
 import numpy as np
 from sklearn.utils import check_array
 
-from depynd.markov_networks import _skeptic, _stars, _glasso, _jose, _gsmn, _iamb, _gsmple
+from depynd.information import Dataset
+from depynd.markov_networks import _skeptic, _skeptic_path, _stars, _glasso, _glasso_path, _jose, _gsmn, _iamb, _gsmple
 
 
-def select(X, method='skeptic', criterion=None, lamb=None, verbose=False, return_lambda=False, **kwargs):
+def select(X, method='skeptic', criterion=None, lamb=None, verbose=False, return_lambda=False, n_jobs=None,
+           random_state=None, cache=None, **kwargs):
     """Learn the structure of Markov random field.
 
     Parameters
     ----------
-    X : array-like, shape (n_samples, n_features)
-        Observations of a set of random variables.
+    X : array-like, shape (n_samples, n_features) or Dataset
+        Observations of a set of random variables. If a :class:`~depynd.information.Dataset` is given, its validated
+        observations are used, and 'gsmn', 'iamb' and 'gsmple' use its column types as well. For these methods,
+        arrays in column-major order, including memory-mapped ones, are used without a copy. See
+        :class:`~depynd.information.Dataset` for memory usage.
     method : {'glasso', 'skeptic', 'gsmn', 'iamb', 'gsmple'}
         Method for structure learning.
     criterion : {'stars', 'none', None}
@@ -21,24 +26,45 @@ def select(X, method='skeptic', criterion=None, lamb=None, verbose=False, return
         If True, the objective function is plotted for each regularization parameter.
     return_lambda : bool, default False
         If True, the selected regularization parameter will be returned.
+    n_jobs : int or None, default None
+        Number of parallel jobs. With 'stars', estimators are fitted to subsamples in parallel. Otherwise, for 'gsmn'
+        and 'iamb', Markov blankets of variables are searched in parallel processes, and for 'gsmple', initial pairwise
+        MI is estimated in parallel threads. ``None`` means 1 unless in a ``joblib.parallel_backend`` context, and -1
+        means using all processors.
+    random_state : int, RandomState instance or None, default None
+        Seed of subsampling in 'stars'.
+    cache : CMICache or None, default None
+        Cache of CMI estimates for 'gsmn', 'iamb' and 'gsmple', which is shared among calls with the same ``X``. It is
+        not used for subsamples in 'stars'.
     kwargs : dict
-        Optional parameters for MI estimation.
+        Optional parameters for MI estimation, or ``correlation`` for 'skeptic'.
 
     Returns
     -------
     adj : array, shape (n_features, n_features)
         Estimated adjacency matrix of an MRF.
     """
-    X = check_array(X, ensure_min_samples=2, ensure_min_features=2)
+    if isinstance(X, Dataset):
+        # The additional variable of the dataset, if any, is not a variable of the MRF.
+        dataset = X if X.y is None else X.with_target(None)
+        X = dataset.X
+        if X.shape[1] < 2:
+            raise ValueError('Found array with %d feature(s) while a minimum of 2 is required.' % X.shape[1])
+    else:
+        X = check_array(X, ensure_min_samples=2, ensure_min_features=2)
+        dataset = None
 
     if lamb is None:
         lamb = [1e-5, 1e-4, 1e-3, 5e-3, 0.01, 0.03, 0.05, 0.08, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1]
 
+    path = None
     if method == 'glasso':
         estimator = _glasso
+        path = _glasso_path
         _check_lamb(lamb, check_non_negative=True, method=method)
     elif method == 'skeptic':
         estimator = _skeptic
+        path = _skeptic_path
         _check_lamb(lamb, check_non_negative=True, method=method)
     elif method == 'jose':
         estimator = _jose
@@ -65,15 +91,13 @@ def select(X, method='skeptic', criterion=None, lamb=None, verbose=False, return
     elif criterion == 'stars':
         if np.iterable(lamb) and len(lamb) > 1:
             lamb = sorted(lamb, reverse=True)  # sort by descending order
-            if 'beta' not in kwargs:
-                kwargs['beta'] = 0.1
-            if 'ratio' not in kwargs:
-                n = len(X)
-                kwargs['ratio'] = 10 * (n ** -0.5) if n > 144 else 0.8
-            if 'rep_num' not in kwargs:
-                kwargs['rep_num'] = 20
+            n = len(X)
+            beta = kwargs.pop('beta', 0.1)
+            ratio = kwargs.pop('ratio', 10 * (n ** -0.5) if n > 144 else 0.8)
+            rep_num = kwargs.pop('rep_num', 20)
             print(lamb)
-            lamb_opt = _stars(X, estimator, lamb=lamb, verbose=verbose, **kwargs)
+            lamb_opt = _stars(X, estimator, lamb=lamb, beta=beta, ratio=ratio, rep_num=rep_num, verbose=verbose,
+                              n_jobs=n_jobs, random_state=random_state, path=path, **kwargs)
         elif np.iterable(lamb) and len(lamb) == 1:
             lamb_opt = next(iter(lamb))
         elif np.isscalar(lamb):
@@ -83,6 +107,10 @@ def select(X, method='skeptic', criterion=None, lamb=None, verbose=False, return
     else:
         raise ValueError('Criteria %s is not implemented.' % criterion)
 
+    if method in ['gsmn', 'iamb', 'gsmple']:
+        kwargs['n_jobs'] = n_jobs
+        kwargs['cache'] = cache
+        X = Dataset(X) if dataset is None else dataset
     if return_lambda:
         return estimator(X, lamb_opt, **kwargs), lamb_opt
     else:
@@ -1,9 +1,11 @@
 import numpy as np
-from sklearn.covariance import graph_lasso  # In the future, graph_lasso will be renamed to graphical_lasso.
 
+from depynd.markov_networks._glasso import _graph_lasso_path
 
-def _skeptic(X, lamb, return_precision=False, **kwargs):
-    """Learn the structure of Markov random field with nonparanormal SKEPTIC using Spearman’s rho [liu2012high]_.
+
+def _skeptic(X, lamb, return_precision=False, correlation='spearman', **kwargs):
+    """Learn the structure of Markov random field with nonparanormal SKEPTIC using Spearman’s rho or Kendall's tau
+    [liu2012high]_.
 
     Parameters
     ----------
@@ -13,6 +15,10 @@ def _skeptic(X, lamb, return_precision=False, **kwargs):
         Regularization parameter.
     return_precision : bool, default False
         If True, the estimated precision matrix will be returned instead of adjacency matrix.
+    correlation : {'spearman', 'kendall'}, default 'spearman'
+        Rank correlation from which the correlation matrix is estimated. Kendall's tau is more robust, and is computed
+        in O(n_samples log n_samples) time for each pair of variables. Both handle ties by average ranks, i.e., tau-b
+        for Kendall's tau.
 
     Returns
     ----------
@@ -24,20 +30,122 @@ def _skeptic(X, lamb, return_precision=False, **kwargs):
     .. [liu2012high] Liu, Han, et al. "High-dimensional semiparametric Gaussian copula graphical models." The Annals of
         Statistics 40.4 (2012): 2293-2326.
     """
+    cov = _rank_correlation(X, correlation)
+    return next(_graph_lasso_path(cov, [lamb], return_precision))
+
+
+def _skeptic_path(X, lamb, return_precision=False, correlation='spearman', **kwargs):
+    """Learn the structures of Markov random field with nonparanormal SKEPTIC for a sequence of regularization
+    parameters.
+
+    The correlation matrix is computed only once, and each problem is solved with a warm start from the solution for
+    the previous regularization parameter. Problems are solved lazily, one per iteration.
+
+    Parameters
+    ----------
+    X : array, shape (n_samples, n_features)
+        Observations of variables.
+    lamb : array-like, shape (n_lambdas)
+        Regularization parameters, which should be in descending order for the warm starts to be effective.
+    return_precision : bool, default False
+        If True, the estimated precision matrices will be returned instead of adjacency matrices.
+    correlation : {'spearman', 'kendall'}, default 'spearman'
+        Rank correlation from which the correlation matrix is estimated.
+
+    Yields
+    ------
+    adj : array, shape (n_features, n_features)
+        Estimated adjacency matrix (or precision matrix if ``return_precision`` is True) of an MRF for each
+        regularization parameter.
+    """
+    cov = _rank_correlation(X, correlation)
+    yield from _graph_lasso_path(cov, lamb, return_precision)
+
+
+def _rank_correlation(X, correlation='spearman'):
     n, d = X.shape
-    indices = np.argsort(X, axis=0)
-    rank = np.empty_like(indices)
-    for r, idx in zip(rank.T, indices.T):
-        r[idx] = np.arange(1, len(X) + 1) - (n + 1) / 2
-    rho = rank.T @ rank
-    stds = np.sqrt(np.diag(rho))
-    rho = rho / stds.reshape(1, -1) / stds.reshape(-1, 1)
-    cov = 2 * np.sin(np.pi / 6 * rho)
-    cov[np.eye(d, dtype=bool)] = 1
-    pre = graph_lasso(cov, lamb)[1]
-    if return_precision:
-        return pre
+    if correlation == 'spearman':
+        low, high = _ranks(X)
+        rank = (low + high) / 2 - (n - 1) / 2
+        rho = rank.T @ rank
+        stds = np.sqrt(np.diag(rho))
+        rho = rho / stds.reshape(1, -1) / stds.reshape(-1, 1)
+        cov = 2 * np.sin(np.pi / 6 * rho)
+    elif correlation == 'kendall':
+        cov = np.sin(np.pi / 2 * _kendall_tau(X))
     else:
-        adj = ~np.isclose(pre, 0)
-        adj[np.eye(len(adj), dtype=bool)] = 0
-        return adj
+        raise ValueError('`%s` is not implemented.' % correlation)
+    cov[np.eye(d, dtype=bool)] = 1
+    return cov
+
+
+def _kendall_tau(X):
+    # Kendall's tau-b for every pair of columns. Discordant pairs are counted as inversions after sorting by the first
+    # column of each pair, for all the pairs sharing the first column at once.
+    n, d = X.shape
+    low, _ = _ranks(X)
+    n_pairs = n * (n - 1) // 2
+    n_tied = np.array([_n_tied(np.sort(low[:, [i]], axis=0))[0] for i in range(d)])
+    tau = np.eye(d)
+    for i in range(d - 1):
+        js = np.arange(i + 1, d)
+        cols = np.arange(len(js))
+        # The lowest ranks among ties are integers less than n, so that they are combined into lexicographic keys.
+        keys = low[:, [i]] * n + low[:, js]
+        order = np.argsort(keys, axis=0, kind='mergesort')
+        n_tied_both = _n_tied(keys[order, cols])
+        n_discordant = _count_inversions(low[:, js][order, cols])
+        n_diff = n_pairs - n_tied[i] - n_tied[js] + n_tied_both - 2 * n_discordant
+        tau[i, js] = tau[js, i] = n_diff / np.sqrt((n_pairs - n_tied[i]) * (n_pairs - n_tied[js]))
+    return tau
+
+
+def _ranks(X):
+    # Lowest and highest 0-based ranks of each element among the ties in its column, for all the columns at once.
+    n, d = X.shape
+    cols = np.arange(d)
+    order = np.argsort(X, axis=0, kind='mergesort')
+    first, last = _runs(X[order, cols])
+    low, high = np.empty_like(order), np.empty_like(order)
+    low[order, cols] = first
+    high[order, cols] = last
+    return low, high
+
+
+def _runs(X_sorted):
+    # First and last positions of the run of equal elements containing each element of the sorted columns.
+    n, d = X_sorted.shape
+    positions = np.arange(n)[:, None]
+    tied = X_sorted[1:] == X_sorted[:-1]
+    untied = np.zeros([1, d], dtype=bool)
+    first = np.maximum.accumulate(np.where(np.vstack([untied, tied]), 0, positions), axis=0)
+    last = np.minimum.accumulate(np.where(np.vstack([tied, untied]), n - 1, positions)[::-1], axis=0)[::-1]
+    return first, last
+
+
+def _n_tied(X_sorted):
+    # Number of pairs of equal elements in each of the sorted columns.
+    first, last = _runs(X_sorted)
+    return np.sum(last - first, axis=0) // 2
+
+
+def _count_inversions(X):
+    # Number of pairs of elements in decreasing order in each column of ranks, which are non-negative integers less than
+    # n_samples, by bottom-up merge sort of all the columns at once.
+    n, d = X.shape
+    size = 1 << (n - 1).bit_length()
+    # Padding with the largest values at the end adds no inversions.
+    X = np.vstack([X, np.full([size - n, d], n, dtype=X.dtype)]).T
+    counts = np.zeros(d, dtype=np.int64)
+    width = 1
+    while width < size:
+        blocks = X.reshape(-1, 2 * width)
+        # A stable sort merges the two sorted halves of each block in linear time, and keeps the elements of the left
+        # half before equal ones of the right half. An element of the right half is thus moved forward by the number of
+        # greater elements of the left half.
+        order = np.argsort(blocks, axis=1, kind='mergesort')
+        positions = np.sum(np.where(order >= width, np.arange(2 * width), 0), axis=1)
+        counts += np.sum((width * width - positions + width * (width - 1) // 2).reshape(d, -1), axis=1)
+        X = blocks[np.arange(len(blocks))[:, None], order].reshape(d, size)
+        width *= 2
+    return counts
@@ -1,20 +1,35 @@
 import numpy as np
-from sklearn.preprocessing import scale
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.utils import check_random_state
 
+from depynd._profile import _phase
+from depynd.markov_networks._glasso import _glasso
+from depynd.markov_networks._skeptic import _skeptic
 
-def _instability(X, estimator, lamb, ratio, rep_num, **kwargs):
-    n, p = X.shape
-    b = int(ratio * n)
-    indices = [np.random.choice(np.arange(n), size=b) for _ in range(rep_num)]
-    samples = [scale(sample) for sample in X[indices, :]]
-    adjs = [estimator(sample, lamb, **kwargs) for sample in samples]
+
+def _instability(adjs):
+    rep_num = len(adjs)
+    p = len(adjs[0])
     theta = np.sum(adjs, axis=0) / rep_num
     xi = 2 * theta * (1 - theta)
     d = np.sum(xi) / p / (p - 1)
     return d
 
 
-def _stars(X, estimator, lamb, beta, ratio, rep_num, verbose=False, **kwargs):
+def _subsample(X, b, seed):
+    from sklearn.preprocessing import scale
+    n, p = X.shape
+    random_state = np.random.RandomState(seed)
+    indices = random_state.choice(np.arange(n), size=b)
+    return scale(X[indices, :])
+
+
+def _fit_subsample(X, estimator, lamb, b, seed, **kwargs):
+    return estimator(_subsample(X, b, seed), lamb, **kwargs)
+
+
+def _stars(X, estimator, lamb, beta, ratio, rep_num, verbose=False, n_jobs=None, random_state=None, path=None,
+           **kwargs):
     """Obtain the best regularization parameter using Stability Approach to Regularization Selection
     [liu2010stability]_.
 
@@ -28,6 +43,17 @@ def _stars(X, estimator, lamb, beta, ratio, rep_num, verbose=False, **kwargs):
     ratio
     rep_num
     verbose
+    n_jobs : int or None, default None
+        Number of jobs fitting the estimator to subsamples in parallel. Threads are used for 'glasso' and 'skeptic',
+        which spend most of the time in BLAS, and processes otherwise. ``None`` means 1 unless in a
+        ``joblib.parallel_backend`` context, and -1 means using all processors.
+    random_state : int, RandomState instance or None, default None
+        Seed of subsampling. Each replicate draws its subsample from its own seed, which is shared among all the
+        regularization parameters, so that the result does not depend on ``n_jobs``.
+    path : callable or None, default None
+        Path solver of ``estimator``, such as :func:`_glasso_path`, which lazily yields the adjacency matrices for
+        the regularization parameters. If given, each subsample is fitted along ``lamb`` with warm starts in threads,
+        instead of being fitted from scratch for each regularization parameter.
 
     Returns
     -------
@@ -39,10 +65,36 @@ def _stars(X, estimator, lamb, beta, ratio, rep_num, verbose=False, **kwargs):
     .. [liu2010stability] Liu, Han, Kathryn Roeder, and Larry Wasserman. "Stability approach to regularization selection
         (stars) for high dimensional graphical models." Advances in neural information processing systems. 2010.
     """
-    for i, l in enumerate(lamb):
-        instability = _instability(X, estimator, l, ratio=ratio, rep_num=rep_num, **kwargs)
-        if instability > beta:
-            return lamb[i - 1]
-        if verbose:
-            print('[stars] lambda: %f, instability: %f' % (l, instability))
+    n, p = X.shape
+    b = int(ratio * n)
+    seeds = check_random_state(random_state).randint(np.iinfo(np.int32).max, size=rep_num)
+    prefer = 'threads' if estimator in [_glasso, _skeptic] else 'processes'
+    require = 'sharedmem' if path is not None else None
+    with Parallel(n_jobs=n_jobs, prefer=prefer, require=require) as parallel:
+        for i, lam, instability in _instabilities(parallel, n_jobs, X, estimator, path, lamb, b, seeds, **kwargs):
+            if instability > beta:
+                return lamb[i - 1]
+            if verbose:
+                print('[stars] lambda: %f, instability: %f' % (lam, instability))
     return 0
+
+
+def _instabilities(parallel, n_jobs, X, estimator, path, lamb, b, seeds, **kwargs):
+    rep_num = len(seeds)
+    if path is not None:
+        # Each path is advanced by one parameter at a time, so that the search still stops early.
+        paths = [path(_subsample(X, b, seed), lamb, **kwargs) for seed in seeds]
+        for i, lam in enumerate(lamb):
+            with _phase('stars.replicate'):
+                adjs = parallel(delayed(next)(path_adjs) for path_adjs in paths)
+            yield i, lam, _instability(adjs)
+        return
+    # Parameters are evaluated in windows just large enough to occupy all jobs, so that the search still stops early.
+    window = int(np.ceil(effective_n_jobs(n_jobs) / rep_num))
+    for start in range(0, len(lamb), window):
+        lamb_window = lamb[start:start + window]
+        with _phase('stars.replicate'):
+            adjs = parallel(delayed(_fit_subsample)(X, estimator, lam, b, seed, **kwargs)
+                            for lam in lamb_window for seed in seeds)
+        for i, lam in enumerate(lamb_window, start):
+            yield i, lam, _instability(adjs[(i - start) * rep_num:(i - start + 1) * rep_num])
@@ -18,8 +18,8 @@ setup(
     long_description=long_description,
     author='Yuya Takashina',
     author_email='takashina2051@gmail.com',
-    packages=find_packages(),
-    install_requires=['numpy>=1.13.0', 'scipy', 'scikit-learn'],
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
+    install_requires=['numpy>=1.13.0', 'scipy', 'scikit-learn', 'joblib>=0.12'],
     test_requires=['pytest', 'flake8'],
     url='https://github.com/y-takashina/depynd',
 )
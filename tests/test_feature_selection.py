@@ -1,13 +1,18 @@
 import numpy as np
 from pytest import raises, fail
 
-from depynd.feature_selection import select
+from depynd.feature_selection import select, select_multi
+from depynd.information import CMICache, Dataset
+from depynd.markov_networks import select as mselect
 
 X = np.random.multivariate_normal(np.zeros(2), np.eye(2), 10)
 x = np.random.normal(0, 1, 10)
 y = np.random.normal(0, 1, 20)
 z = np.empty([10, 0])
 methods = ['mifs', 'mrmr']
+rng = np.random.RandomState(0)
+U = rng.multivariate_normal(np.zeros(4), np.eye(4) + 0.5, 50)
+u = U[:, 0] + rng.normal(0, 1, 50)
 
 
 class TestSelect:
@@ -61,3 +66,64 @@ class TestSelect:
             fail()
         with raises(ValueError):
             select(X, x, method='')
+
+    def test_cache(self):
+        cache = CMICache()
+        for method in methods:
+            indices = select(U, u, method=method, mi_estimator='knn_cmi')
+            assert indices == select(U, u, method=method, mi_estimator='knn_cmi', cache=cache)
+        v = U[:, 1] + np.random.normal(0, 1, 50)
+        assert select(U, v, mi_estimator='knn_cmi') == select(U, v, mi_estimator='knn_cmi', cache=cache)
+        with raises(ValueError):
+            select(U[::-1], u, mi_estimator='knn_cmi', cache=cache)
+
+    def test_shared_cache(self):
+        cache = CMICache()
+        mselect(U, 'gsmn', lamb=0.01, mi_estimator='knn_cmi', cache=cache)
+        hits = cache.hits
+        indices = select(U, u, method='mrmr', mi_estimator='knn_cmi', cache=cache)
+        assert indices == select(U, u, method='mrmr', mi_estimator='knn_cmi')
+        # Redundancy between the features was estimated by the structure learner.
+        assert cache.hits > hits
+
+    def test_dataset(self):
+        dataset = Dataset(U)
+        for method in methods:
+            assert select(dataset, u, method=method) == select(U, u, method=method)
+        assert select_multi(dataset, np.vstack([u, u]).T) == [select(U, u)] * 2
+        with raises(ValueError):
+            select(Dataset(U[:, :1]), u)
+
+    def test_dtype(self):
+        for method in methods:
+            assert select(U, u, method=method, k=2, mi_estimator='knn_cmi', dtype=np.float32) == \
+                select(U, u, method=method, k=2, mi_estimator='knn_cmi')
+
+    def test_mrmr(self):
+        indices = select(U, u, lamb=-np.inf, method='mrmr')
+        assert sorted(indices) == list(range(4))
+        for k in range(1, 5):
+            assert select(U, u, k=k, method='mrmr') == indices[:k]
+
+    def test_n_jobs(self):
+        for method in methods:
+            assert select(U, u, method=method) == select(U, u, method=method, n_jobs=2)
+
+
+class TestSelectMulti:
+    def test_consistency(self):
+        # No target duplicates a feature, which would tie objectives of 'mrmr' at zero, so that the shared estimates
+        # summed in another order could resolve them differently.
+        random_state = np.random.RandomState(0)
+        V = np.vstack([U[:, 0] + random_state.normal(0, 1, 50), random_state.randint(0, 2, 50), U[:, 3] - U[:, 2]]).T
+        for method in methods:
+            for kwargs in [dict(), dict(k=2), dict(mi_estimator='knn_cmi')]:
+                indices = select_multi(U, V, method=method, **kwargs)
+                assert indices == [select(U, v, method=method, **kwargs) for v in V.T]
+        assert select_multi(U, V[:, 0]) == [select(U, V[:, 0])]
+
+    def test_length(self):
+        with raises(AssertionError):
+            select_multi(X, np.vstack([y, y]).T)
+        with raises(ValueError):
+            select_multi(X, np.empty([10, 0]))
@@ -1,13 +1,23 @@
+import os
+import pickle
+import subprocess
+import sys
+
 import numpy as np
 from pytest import raises, fail, approx
 
-from depynd.information import mutual_information, conditional_mutual_information
+from depynd import profile
+from depynd.information import mutual_information, conditional_mutual_information, \
+    batch_conditional_mutual_information, pairwise_mutual_information, CMICache, Dataset, DiskCache, \
+    PluginMIAccumulator
 
 X = np.random.multivariate_normal(np.zeros(2), np.eye(2), 10)
 w = np.random.randint(0, 2, 10)
 x = np.random.normal(0, 1, 10)
 y = np.random.normal(0, 1, 20)
 z = np.empty([10, 0])
+rng = np.random.RandomState(0)
+U = rng.multivariate_normal(np.zeros(4), np.eye(4) + 0.5, 50)
 
 
 class TestMi:
@@ -45,14 +55,51 @@ class TestMi:
         with raises(AssertionError):
             mutual_information(X, X, mi_estimator='knn', n_neighbors=0.1)
 
+    def test_knn_algorithm(self):
+        U = np.hstack([X, w[:, None]])
+        for A, B in [(x, X), (x, w), (X, U), (U, U)]:
+            mi_brute = mutual_information(A, B, mi_estimator='knn', algorithm='brute')
+            mi_tree = mutual_information(A, B, mi_estimator='knn', algorithm='tree')
+            mi_auto = mutual_information(A, B, mi_estimator='knn', algorithm='auto')
+            mi_chunked = mutual_information(A, B, mi_estimator='knn', algorithm='brute', working_memory=1e-3)
+            assert mi_brute == approx(mi_tree)
+            assert mi_brute == approx(mi_auto)
+            assert mi_brute == approx(mi_chunked)
+        with raises(AssertionError):
+            mutual_information(X, X, mi_estimator='knn', algorithm='')
+        with raises(AssertionError):
+            mutual_information(X, X, mi_estimator='knn', working_memory=0)
+
+    def test_knn_algorithm_ties(self):
+        # Ties at the search radius on mixed data are counted in the same way by both algorithms.
+        rng = np.random.RandomState(0)
+        A = np.round(rng.normal(0, 1, 30), 1)
+        B = np.vstack([rng.randint(0, 3, 30), np.round(rng.normal(0, 1, 30), 1)]).T
+        assert mutual_information(A, B, mi_estimator='knn', algorithm='brute') == \
+            mutual_information(A, B, mi_estimator='knn', algorithm='tree')
+
     def test_dr(self):
         try:
             mutual_information(X, X, mi_estimator='dr', sigma=1)
             mutual_information(X, X, mi_estimator='dr', n_bases=1)
             mutual_information(X, X, mi_estimator='dr', maxiter=1)
+            for centers in ['kmeans', 'minibatch', 'random']:
+                for solver in ['slsqp', 'lsmi']:
+                    mutual_information(X, X, mi_estimator='dr', centers=centers, solver=solver)
         except (KeyError, ValueError):
             fail()
         assert np.isnan(mutual_information(X, X, mi_estimator='dr', maxiter=1))
+        U = np.random.multivariate_normal(np.zeros(2), [[1, 0.8], [0.8, 1]], 1000)
+        mi = -0.5 * np.log(1 - 0.8 ** 2)
+        for solver in ['slsqp', 'lsmi']:
+            assert mutual_information(U[:, 0], U[:, 1], mi_estimator='dr', sigma=0.5, n_bases=100,
+                                      centers='random', solver=solver) == approx(mi, abs=0.25)
+        with raises(AssertionError):
+            mutual_information(X, X, mi_estimator='dr', centers='')
+        with raises(AssertionError):
+            mutual_information(X, X, mi_estimator='dr', solver='')
+        with raises(AssertionError):
+            mutual_information(X, X, mi_estimator='dr', reg=-1)
         with raises(AssertionError):
             mutual_information(X, X, mi_estimator='dr', sigma=0)
         with raises(AssertionError):
@@ -64,6 +111,29 @@ class TestMi:
         with raises(AssertionError):
             mutual_information(X, X, mi_estimator='dr', maxiter=0.1)
 
+    def test_dtype(self):
+        # kNN-based estimates in float32 differ from those in float64 by at most 1 / n_samples for each count of
+        # neighbors changed by rounding errors.
+        U = np.random.multivariate_normal(np.zeros(4), np.eye(4) + 0.5, 100)
+        for mi_estimator in ['knn', 'knn_cmi']:
+            for algorithm in ['brute', 'tree']:
+                kwargs = dict(mi_estimator=mi_estimator, algorithm=algorithm)
+                mi = mutual_information(U[:, 0], U[:, 1], **kwargs)
+                assert mutual_information(U[:, 0], U[:, 1], dtype=np.float32, **kwargs) == approx(mi, abs=2e-2)
+                cmi = conditional_mutual_information(U[:, 0], U[:, 1], U[:, 2], **kwargs)
+                assert conditional_mutual_information(U[:, 0], U[:, 1], U[:, 2], dtype='float32',
+                                                      **kwargs) == approx(cmi, abs=2e-2)
+                cmis = batch_conditional_mutual_information(U[:, 0], U[:, 1:3], U[:, 3], **kwargs)
+                assert batch_conditional_mutual_information(U[:, 0], U[:, 1:3], U[:, 3], dtype=np.float32,
+                                                            **kwargs) == approx(cmis, abs=2e-2)
+        kwargs = dict(mi_estimator='dr', sigma=0.5, n_bases=20, centers='random', solver='lsmi')
+        np.random.seed(0)
+        mi = mutual_information(U[:, 0], U[:, 1], **kwargs)
+        np.random.seed(0)
+        assert mutual_information(U[:, 0], U[:, 1], dtype=np.float32, **kwargs) == approx(mi, abs=1e-4)
+        with raises(AssertionError):
+            mutual_information(U[:, 0], U[:, 1], mi_estimator='knn', dtype=np.int64)
+
     def test_length(self):
         with raises(AssertionError):
             mutual_information(x, y)
@@ -140,3 +210,264 @@ class TestCmi:
             fail()
         with raises(ValueError):
             conditional_mutual_information(x, x, x, mi_estimator='')
+
+    def test_plugin(self):
+        v = np.random.randint(0, 3, 10)
+        u = np.random.randint(0, 2, [10, 2])
+        for A, B, C in [(w, v, u), (u, w, v), (w, w, w), (v, u, np.c_[w, v])]:
+            cmi = conditional_mutual_information(A, B, C, mi_estimator='plugin')
+            cmi_diff = mutual_information(np.c_[A, C], B, mi_estimator='plugin') - \
+                mutual_information(B, C, mi_estimator='plugin')
+            assert cmi == approx(cmi_diff)
+            assert cmi == conditional_mutual_information(A, B, C, mi_estimator='auto')
+        assert 0 == approx(conditional_mutual_information(w, w, w, mi_estimator='plugin'))
+        with raises(AssertionError):
+            conditional_mutual_information(x, w, w, mi_estimator='plugin')
+
+    def test_knn_cmi(self):
+        try:
+            conditional_mutual_information(x, w, x, mi_estimator='knn_cmi', is_discrete='auto')
+            conditional_mutual_information(X, x, X, mi_estimator='knn_cmi', is_discrete=False)
+        except ValueError:
+            fail()
+        for A, B, C in [(x, x, X), (x, w, X), (X, w, w)]:
+            cmi_brute = conditional_mutual_information(A, B, C, mi_estimator='knn_cmi', algorithm='brute')
+            cmi_tree = conditional_mutual_information(A, B, C, mi_estimator='knn_cmi', algorithm='tree')
+            assert cmi_brute == approx(cmi_tree)
+        assert mutual_information(x, X, mi_estimator='knn') == \
+            approx(conditional_mutual_information(x, X, z, mi_estimator='knn_cmi'))
+        assert 0 == conditional_mutual_information(z, w, w, mi_estimator='knn_cmi')
+        with raises(AssertionError):
+            conditional_mutual_information(x, x, x, mi_estimator='knn_cmi', n_neighbors=10)
+        with raises(TypeError):
+            conditional_mutual_information(x, x, x, mi_estimator='knn_cmi', is_discrete=1)
+
+
+class TestBatchCmi:
+    def test_consistency(self):
+        Y = np.vstack([x, w, X.T]).T
+        for A, C in [(x, z), (x, w), (X, x), (w, w)]:
+            for mi_estimator in ['auto', 'knn', 'knn_cmi']:
+                cmis = batch_conditional_mutual_information(A, Y, C, mi_estimator=mi_estimator)
+                cmis_first = batch_conditional_mutual_information(A, Y, C, mi_estimator=mi_estimator,
+                                                                  candidates_first=True)
+                for j, col in enumerate(Y.T):
+                    assert cmis[j] == approx(conditional_mutual_information(A, col, C, mi_estimator=mi_estimator))
+                    assert cmis_first[j] == approx(conditional_mutual_information(col, A, C, mi_estimator=mi_estimator))
+        W = np.vstack([w, 1 - w, np.random.randint(0, 3, 10)]).T
+        for A, C in [(w, z), (w, W[:, 2]), (W[:, 2], W[:, :2])]:
+            cmis = batch_conditional_mutual_information(A, W, C, mi_estimator='plugin')
+            cmis_first = batch_conditional_mutual_information(A, W, C, mi_estimator='plugin', candidates_first=True)
+            for j, col in enumerate(W.T):
+                assert cmis[j] == approx(conditional_mutual_information(A, col, C, mi_estimator='plugin'))
+                assert cmis_first[j] == approx(conditional_mutual_information(col, A, C, mi_estimator='plugin'))
+
+    def test_dimension(self):
+        assert batch_conditional_mutual_information(x, X, x).shape == (2,)
+        assert batch_conditional_mutual_information(x, x, x).shape == (1,)
+        assert batch_conditional_mutual_information(x, z, x).shape == (0,)
+        assert np.all(batch_conditional_mutual_information(z, X, x) == 0)
+        with raises(AssertionError):
+            batch_conditional_mutual_information(x, X, y)
+        with raises(TypeError):
+            batch_conditional_mutual_information(x, X, x, is_discrete=1)
+
+
+class TestPairwiseMi:
+    def test_consistency(self):
+        U = np.vstack([x, w, X.T]).T
+        for mi_estimator in ['auto', 'knn']:
+            for n_jobs in [None, 2]:
+                mis = pairwise_mutual_information(U, mi_estimator=mi_estimator, n_jobs=n_jobs)
+                assert np.allclose(mis, mis.T)
+                assert np.all(np.diag(mis) == 0)
+                for i in range(U.shape[1]):
+                    for j in range(i):
+                        assert mis[i, j] == approx(mutual_information(U[:, i], U[:, j], mi_estimator=mi_estimator))
+        W = np.vstack([w, 1 - w, np.random.randint(0, 3, 10)]).T
+        mis = pairwise_mutual_information(W, mi_estimator='plugin')
+        assert mis[1, 0] == approx(mutual_information(w, 1 - w, mi_estimator='plugin'))
+
+    def test_mi_estimator(self):
+        with raises(AssertionError):
+            pairwise_mutual_information(X, mi_estimator='plugin')
+        with raises(ValueError):
+            pairwise_mutual_information(X, mi_estimator='')
+        with raises(TypeError):
+            pairwise_mutual_information(X, is_discrete=1)
+
+    def test_profile(self):
+        # Estimates in worker threads are nested in the pairwise call, which is recorded once.
+        with profile() as prof:
+            pairwise_mutual_information(U, mi_estimator='dr', centers='random', solver='lsmi', n_jobs=2)
+        report = prof.report()
+        assert [(stats['function'], stats['calls']) for stats in report['estimators']] == \
+            [('pairwise_mutual_information', 1)]
+
+
+class TestCMICache:
+    def test_consistency(self):
+        U = np.vstack([x, w, X.T]).T
+        cache = CMICache().bind(U, mi_estimator='knn_cmi')
+        assert cache.conditional_mutual_information(0, 2, [1, 3]) == \
+            conditional_mutual_information(x, X[:, 0], U[:, [1, 3]], mi_estimator='knn_cmi')
+        assert cache.conditional_mutual_information(2, 0, [3, 1]) == cache.conditional_mutual_information(0, 2, [1, 3])
+        assert cache.cache_info() == (2, 1, None, 1)
+        cmis = cache.batch_conditional_mutual_information(0, [1, 2], [3])
+        assert np.all(cmis == batch_conditional_mutual_information(x, U[:, [1, 2]], U[:, 3], mi_estimator='knn_cmi'))
+        assert np.allclose(cache.pairwise_mutual_information(), pairwise_mutual_information(U, mi_estimator='knn_cmi'))
+        assert np.all(cache.pairwise_mutual_information() == cache.pairwise_mutual_information())
+        cache = CMICache().bind(U, mi_estimator='knn_cmi')
+        cmis = cache.batch_conditional_mutual_information(0, [1, 2, 3], [], n_jobs=2)
+        assert np.all(cmis == batch_conditional_mutual_information(x, U[:, 1:], z, mi_estimator='knn_cmi'))
+        triples = [(0, 1, [2]), (1, 2, [0, 3]), (0, 1, [])]
+        cmis = cache.conditional_mutual_information_many(triples, n_jobs=2)
+        assert np.all(cmis == [cache.conditional_mutual_information(*triple) for triple in triples])
+
+    def test_target(self):
+        cache = CMICache().bind(X, y=x)
+        assert cache.conditional_mutual_information(0, 2, [1]) == conditional_mutual_information(X[:, 0], x, X[:, 1])
+        assert cache.pairwise_mutual_information().shape == (3, 3)
+
+    def test_maxsize(self):
+        cache = CMICache(maxsize=1).bind(X)
+        cache.conditional_mutual_information(0, 1, [])
+        cache.conditional_mutual_information(0, 1, [])
+        cache.batch_conditional_mutual_information(0, [1], [1])
+        cache.conditional_mutual_information(0, 1, [])
+        assert cache.cache_info() == (1, 3, 1, 1)
+        cache.clear()
+        assert cache.cache_info() == (0, 0, 1, 0)
+        cache = CMICache(maxsize=0).bind(X)
+        cache.conditional_mutual_information(0, 1, [])
+        cache.conditional_mutual_information(0, 1, [])
+        assert cache.cache_info() == (0, 2, 0, 0)
+        with raises(AssertionError):
+            CMICache(maxsize=-1)
+
+    def test_bind(self):
+        cache = CMICache().bind(X)
+        try:
+            cache.bind(X.copy(), mi_estimator='auto', algorithm='brute')
+        except ValueError:
+            fail()
+        with raises(ValueError):
+            cache.bind(X[::-1])
+        with raises(ValueError):
+            cache.bind(X, mi_estimator='knn_cmi')
+
+
+class TestDataset:
+    def test_columns(self):
+        U = np.vstack([x, w, X.T]).T
+        dataset = Dataset(U, y=w)
+        assert dataset.shape == (10, 4)
+        assert np.all(dataset.n_unique == [10, len(set(w)), 10, 10, len(set(w))])
+        assert dataset.discrete_of([0, 1, 4]) == [False, True, True]
+        assert np.all(dataset.columns([4, 0]) == np.vstack([w, x]).T)
+        assert dataset.with_target(None).discrete_of(range(4)) == dataset.discrete_of(range(4))
+        assert np.all(pairwise_mutual_information(dataset) == pairwise_mutual_information(U))
+        cache = CMICache().bind(dataset)
+        assert cache.conditional_mutual_information(0, 4, [1]) == conditional_mutual_information(x, w, w)
+        with raises(AssertionError):
+            Dataset(U, y)
+        with raises(ValueError):
+            Dataset(x)
+
+    def test_memmap(self, tmpdir):
+        U = np.vstack([x, w, X.T]).T
+        path = str(tmpdir.join('U.npy'))
+        np.save(path, np.asfortranarray(U))
+        M = np.load(path, mmap_mode='r')
+        dataset = Dataset(M)
+        assert np.shares_memory(dataset.X, M) and dataset.columns(range(4)) is dataset.X
+        assert dataset.column(2).flags.c_contiguous
+        assert Dataset(U).X.flags.f_contiguous
+        cache = CMICache().bind(dataset)
+        assert cache.conditional_mutual_information(0, 2, [1]) == conditional_mutual_information(x, X[:, 0], w)
+
+
+class TestDiskCache:
+    def test_reuse(self, tmpdir):
+        mi = mutual_information(U[:, 0], U[:, 1], disk_cache=DiskCache(str(tmpdir)))
+        cmi = conditional_mutual_information(U[:, 0], U[:, 1], U[:, 2:], disk_cache=DiskCache(str(tmpdir)))
+        disk_cache = DiskCache(str(tmpdir))
+        assert mutual_information(U[:, 0], U[:, 1], disk_cache=disk_cache) == mi
+        assert conditional_mutual_information(U[:, 0], U[:, 1], U[:, [3, 2]], disk_cache=disk_cache) == cmi
+        assert mutual_information(U[:, 0], U[:, 1], n_neighbors=5, disk_cache=disk_cache) != mi
+        assert (disk_cache.hits, disk_cache.misses, len(disk_cache)) == (2, 1, 3)
+        # Estimates are shared between the public functions and CMICache, and MI is symmetric for 'knn'.
+        cmis = CMICache(disk_cache=disk_cache).bind(U).batch_conditional_mutual_information(0, [1, 2, 3], [])
+        assert cmis[0] == mi
+        assert CMICache(disk_cache=disk_cache).bind(U).conditional_mutual_information(2, 0, []) == cmis[1]
+        assert disk_cache.hits == 4
+        disk_cache.clear()
+        assert len(disk_cache) == 0
+
+    def test_order(self, tmpdir):
+        # CMI as the difference of MI estimates is not symmetric, so that estimates in the other order are not reused.
+        disk_cache = DiskCache(str(tmpdir))
+        cmi_yx = conditional_mutual_information(U[:, 1], U[:, 0], U[:, 2], disk_cache=disk_cache)
+        cmi_xy = conditional_mutual_information(U[:, 0], U[:, 1], U[:, 2], disk_cache=disk_cache)
+        assert cmi_xy == conditional_mutual_information(U[:, 0], U[:, 1], U[:, 2]) != cmi_yx
+        cache = CMICache(disk_cache=disk_cache).bind(U)
+        assert cache.batch_conditional_mutual_information(0, [1], [2], candidates_first=True)[0] == cmi_yx
+        assert CMICache(disk_cache=disk_cache).bind(U).conditional_mutual_information(0, 1, [2]) == cmi_xy
+        assert (disk_cache.hits, len(disk_cache)) == (2, 2)
+
+    def test_maxsize(self, tmpdir):
+        disk_cache = DiskCache(str(tmpdir), maxsize=2)
+        for j in [1, 2, 1, 3]:
+            mutual_information(U[:, 0], U[:, j], disk_cache=disk_cache)
+        assert (disk_cache.hits, len(disk_cache)) == (1, 2)
+        # The estimate for column 1 was used after that for column 2, which has been discarded instead.
+        mutual_information(U[:, 0], U[:, 1], disk_cache=disk_cache)
+        mutual_information(U[:, 0], U[:, 2], disk_cache=disk_cache)
+        assert disk_cache.hits == 2
+        with raises(AssertionError):
+            DiskCache(str(tmpdir), maxsize=0)
+
+
+class TestPluginMIAccumulator:
+    U = np.random.randint(0, 3, [200, 3])
+
+    def test_chunks(self):
+        acc = PluginMIAccumulator()
+        for start in range(0, 200, 30):
+            acc.partial_fit(self.U[start:start + 30, :2], self.U[start:start + 30, 1], self.U[start:start + 30, 2])
+        assert acc.n_samples == 200
+        assert acc.mutual_information() == approx(mutual_information(self.U[:, :2], self.U[:, 1]))
+        assert acc.conditional_mutual_information() == approx(
+            conditional_mutual_information(self.U[:, :2], self.U[:, 1], self.U[:, 2]))
+        with raises(ValueError):
+            acc.partial_fit(self.U[:, 0], self.U[:, 1])
+
+    def test_merge(self):
+        acc = PluginMIAccumulator().partial_fit(self.U[:, 0], self.U[:, 1])
+        left = PluginMIAccumulator().partial_fit(self.U[:80, 0], self.U[:80, 1])
+        right = pickle.loads(pickle.dumps(PluginMIAccumulator().partial_fit(self.U[80:, 0], self.U[80:, 1])))
+        merged = left.merge(right)
+        assert merged.mutual_information() == approx(acc.mutual_information())
+        assert merged.conditional_mutual_information() == merged.mutual_information()
+        with raises(ValueError):
+            merged.merge(PluginMIAccumulator().partial_fit(self.U[:, :2], self.U[:, 2]))
+
+    def test_decay(self):
+        with raises(AssertionError):
+            PluginMIAccumulator(decay=0)
+        with raises(ValueError):
+            PluginMIAccumulator(decay=0.5).mutual_information()
+        acc = PluginMIAccumulator(decay=1e-12).partial_fit(self.U[:, 0], self.U[:, 0])
+        acc.partial_fit(self.U[:100, 0], self.U[:100, 1])
+        assert acc.n_samples == approx(100)
+        assert acc.mutual_information() == approx(mutual_information(self.U[:100, 0], self.U[:100, 1]))
+
+
+def test_import():
+    # Slow dependencies are only imported by the functions using them.
+    code = 'import sys, depynd.information, depynd.feature_selection, depynd.markov_networks; print(*sys.modules)'
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    modules = subprocess.check_output([sys.executable, '-c', code], cwd=root).decode().split()
+    for module in ['scipy.optimize', 'sklearn.cluster', 'sklearn.covariance', 'sklearn.linear_model',
+                   'sklearn.neighbors', 'sklearn.preprocessing']:
+        assert module not in modules
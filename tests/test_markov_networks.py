@@ -1,12 +1,18 @@
 import numpy as np
-from pytest import raises, fail
+from pytest import raises, fail, approx
+from scipy.stats import kendalltau, spearmanr
 
-from depynd.markov_networks import select
+from depynd import profile
+from depynd.information import CMICache, Dataset
+from depynd.markov_networks import select, _glasso, _glasso_path, _skeptic, _skeptic_path
+from depynd.markov_networks._skeptic import _rank_correlation
 
 X = np.random.multivariate_normal(np.zeros(2), np.eye(2), 10)
 x = np.random.normal(0, 1, 10)
 methods = ['glasso', 'skeptic', 'gsmn', 'iamb', 'gsmple']
 criteria = ['stars', 'none']
+rng = np.random.RandomState(0)
+U = rng.multivariate_normal(np.zeros(4), np.eye(4) + 0.5, 50)
 
 
 class TestSelect:
@@ -72,3 +78,88 @@ class TestSelect:
             select(X, method='glasso', criterion='none', lamb=[-0.1, 0, 0.1])
         with raises(ValueError):
             select(X, method='glasso', criterion='stars', lamb=[-0.1, 0, 0.1])
+
+    def test_n_jobs(self):
+        for method in ['gsmn', 'iamb', 'gsmple']:
+            adj = select(U, method=method, lamb=0.01)
+            assert np.all(adj == select(U, method=method, lamb=0.01, n_jobs=2))
+        # Estimates made in the processes are added to the given cache.
+        cache = CMICache()
+        select(U, method='gsmn', lamb=0.01, n_jobs=2, cache=cache)
+        assert len(cache) > 0
+
+    def test_cache(self):
+        cache = CMICache()
+        for method in ['gsmple', 'gsmn', 'iamb']:
+            adj = select(U, method=method, lamb=0.01, mi_estimator='knn_cmi')
+            assert np.all(adj == select(U, method=method, lamb=0.01, mi_estimator='knn_cmi', cache=cache))
+        assert cache.hits > 0
+
+    def test_dataset(self):
+        for method in methods:
+            assert np.all(select(Dataset(U, y=U[:, 0]), method=method, lamb=0.1) == select(U, method=method, lamb=0.1))
+        with raises(ValueError):
+            select(Dataset(x[:, None]))
+
+    def test_dtype(self):
+        for method in ['gsmn', 'iamb', 'gsmple']:
+            adj = select(U, method=method, lamb=0.1, mi_estimator='knn_cmi')
+            assert np.all(adj == select(U, method=method, lamb=0.1, mi_estimator='knn_cmi', dtype=np.float32))
+
+    def test_random_state(self):
+        for method in ['glasso', 'iamb']:
+            kwargs = dict(method=method, criterion='stars', lamb=[0.01, 0.05, 0.1], rep_num=4, random_state=0,
+                          return_lambda=True)
+            adj, lamb = select(U, **kwargs)
+            adj_parallel, lamb_parallel = select(U, n_jobs=2, **kwargs)
+            assert lamb == lamb_parallel
+            assert np.all(adj == adj_parallel)
+
+
+def test_path():
+    lamb = [0.5, 0.1, 0.01]
+    for estimator, path in [(_glasso, _glasso_path), (_skeptic, _skeptic_path)]:
+        for adj, l in zip(path(U, lamb), lamb):
+            assert np.all(adj == estimator(U, l))
+
+
+def test_rank_correlation():
+    # Ties are handled by average ranks, i.e., tau-b for Kendall's tau.
+    U = np.random.randint(0, 3, [40, 4]).astype(float)
+    U[:, 3] += U[:, 0]
+    rho = np.array([[spearmanr(u, v)[0] for v in U.T] for u in U.T])
+    tau = np.array([[kendalltau(u, v)[0] for v in U.T] for u in U.T])
+    assert _rank_correlation(U, 'spearman') == approx(2 * np.sin(np.pi / 6 * rho))
+    assert _rank_correlation(U, 'kendall') == approx(np.sin(np.pi / 2 * tau))
+    adj = select(U, method='skeptic', lamb=0.1, correlation='kendall')
+    assert adj.shape == (4, 4) and np.all(adj == adj.T)
+    with raises(ValueError):
+        select(U, method='skeptic', lamb=0.1, correlation='pearson')
+
+
+def test_jose():
+    B = (np.random.rand(200, 4) < 0.5).astype(float)
+    B[:, 1] = np.where(np.random.rand(200) < 0.9, B[:, 0], 1 - B[:, 0])
+    adj = select(B, method='jose', lamb=0.01)
+    assert np.all(adj == adj.T) and not np.any(np.diag(adj))
+    assert adj[0, 1]
+    with raises(ValueError):
+        select(X, method='jose', lamb=0.01)
+
+
+def test_profile():
+    with profile() as prof:
+        select(U, method='gsmn', lamb=0.1, mi_estimator='knn_cmi')
+        select(U, method='glasso', criterion='stars', lamb=[0.5, 0.1], rep_num=2, random_state=0)
+    report = prof.report()
+    assert {stats['phase'] for stats in report['phases']} == {'gsmn.grow', 'gsmn.shrink', 'stars.replicate'}
+    assert {stats['calls'] for stats in report['phases'] if stats['phase'].startswith('gsmn')} == {4}
+    assert len(report['estimators']) > 0
+    for stats in report['estimators']:
+        assert stats['function'].endswith('conditional_mutual_information') and stats['mi_estimator'] == 'knn_cmi'
+        assert stats['calls'] == sum(stats['n_conditioning'].values()) and stats['estimates'] >= stats['calls']
+        assert stats['n_samples'] == {50: stats['calls']}
+    with profile() as prof:
+        pass
+    select(U, method='gsmn', lamb=0.1)
+    assert prof.report() == {'estimators': [], 'phases': []}